@@ -6,8 +6,10 @@ Web application for calculating SCS Curve Numbers with open-source tools
 import gradio as gr
 import geopandas as gpd
 import pandas as pd
+import pyogrio
 import os
 import base64
+import functools
 import socket
 import sys
 from pathlib import Path
@@ -20,6 +22,7 @@ from src import data_prep
 import json
 import zipfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # App identity. The GUI header must always show the app name with the
@@ -164,6 +167,28 @@ def resolve_target_crs(crs_epsg, reference_gdf, logger=None):
     return epsg
 
 
+@functools.lru_cache(maxsize=4)
+def _read_vector_cached(path, mtime, size):
+    """Parse a layer once per (path, mtime, size); see read_vector_layer."""
+    return gpd.read_file(path, engine="pyogrio", use_arrow=True)
+
+
+def read_vector_layer(path):
+    """
+    Read a vector layer into a GeoDataFrame.
+
+    Uses the pyogrio engine with Arrow, so GDAL hands whole columns to
+    geopandas instead of building features one at a time in Python.
+
+    Parsed layers are cached by path, modification time, and size, so
+    clicking Calculate again after changing only a setting such as the cell
+    size does not re-read the uploads. Each call returns its own copy, so
+    callers can modify the result without touching the cache.
+    """
+    stat = os.stat(path)
+    return _read_vector_cached(str(path), stat.st_mtime, stat.st_size).copy()
+
+
 def get_column_options(file, preferred_names=None, fallback_value=None):
     """Read layer fields and update a field selector dropdown."""
     if file is None:
@@ -172,8 +197,8 @@ def get_column_options(file, preferred_names=None, fallback_value=None):
 
     preferred_names = {name.lower() for name in (preferred_names or [])}
     try:
-        gdf = gpd.read_file(file.name)
-        fields = [column for column in gdf.columns if column != "geometry"]
+        # The field list comes from the layer header, so no features are read
+        fields = list(pyogrio.read_info(file.name)["fields"])
     except Exception:
         choices = [fallback_value] if fallback_value else []
         return gr.update(choices=choices, value=fallback_value)
@@ -188,50 +213,58 @@ def get_column_options(file, preferred_names=None, fallback_value=None):
     )
     return gr.update(choices=fields, value=default_field)
 
+# Components a zipped shapefile must contain, in the order they are reported
+SHAPEFILE_REQUIRED_EXTENSIONS = ('.shp', '.shx', '.dbf')
+VECTOR_FILE_EXTENSIONS = {'.shp', '.gpkg', '.geojson', '.json'}
+
+
 def validate_shapefile_upload(file):
     """Validate that a shapefile upload contains required components."""
     if file is None:
         return False, "No file uploaded"
     
+    extension = os.path.splitext(file.name)[1].lower()
     try:
         # Check if it's a zip file containing shapefile components
-        if file.name.endswith('.zip'):
+        if extension == '.zip':
             with zipfile.ZipFile(file.name, 'r') as zip_ref:
-                file_list = zip_ref.namelist()
-                # Check for required shapefile components
-                has_shp = any(f.endswith('.shp') for f in file_list)
-                has_shx = any(f.endswith('.shx') for f in file_list)
-                has_dbf = any(f.endswith('.dbf') for f in file_list)
-                
-                if has_shp and has_shx and has_dbf:
-                    return True, "Valid shapefile archive"
-                else:
-                    missing = []
-                    if not has_shp: missing.append('.shp')
-                    if not has_shx: missing.append('.shx') 
-                    if not has_dbf: missing.append('.dbf')
-                    return False, f"Missing required shapefile components: {', '.join(missing)}"
-        
+                # One pass over the archive listing collects every extension
+                extensions = {os.path.splitext(f)[1].lower() for f in zip_ref.namelist()}
+            missing = [ext for ext in SHAPEFILE_REQUIRED_EXTENSIONS if ext not in extensions]
+            if not missing:
+                return True, "Valid shapefile archive"
+            return False, f"Missing required shapefile components: {', '.join(missing)}"
+
         # For individual file uploads, provide guidance
-        elif file.name.endswith(('.shp', '.gpkg', '.geojson', '.json')):
-            if file.name.endswith('.shp'):
+        elif extension in VECTOR_FILE_EXTENSIONS:
+            if extension == '.shp':
                 return True, "Note: For shapefiles, ensure you also have .shx, .dbf, and .prj files. Consider uploading as a ZIP archive containing all components."
             else:
                 return True, "Valid geospatial file format"
-        
-        # Try to read with geopandas to validate
+
+        # Read only the layer header to validate; no geometry is decoded
         try:
-            test_gdf = gpd.read_file(file.name)
-            if len(test_gdf) > 0:
+            info = pyogrio.read_info(file.name, force_feature_count=True)
+            if info["features"] > 0:
                 return True, "Valid geospatial file"
             else:
                 return False, "File appears to be empty"
-        except:
+        except Exception:
             return False, "Unable to read as geospatial data"
             
     except Exception as e:
         return False, f"Error validating file: {str(e)}"
 
+def save_cn_polygons(dissolved_gdf, vector_path):
+    """Write the dissolved CN polygons to a GeoPackage for download."""
+    # The file is only offered for download, never queried by the app, so
+    # skip building the GeoPackage R-tree index
+    dissolved_gdf.to_file(
+        vector_path, driver='GPKG', engine='pyogrio',
+        layer_options={'SPATIAL_INDEX': 'NO'},
+    )
+    return vector_path
+
 def build_result(vector_path=None, raster_path=None, report_html=None, map_html=None,
                  excel_output=None, gcn10_raster_path=None, gcn10_csv_path=None,
                  status_message=""):
@@ -261,7 +294,14 @@ def process_curve_numbers(
     gcn10_drainage,
     progress=None
 ):
-    """Main processing function for Gradio interface."""
+    """
+    Main processing function for Gradio interface.
+
+    This is a generator. It yields a partial result tuple as soon as the
+    CN polygons and raster are on disk, so they can be downloaded while the
+    statistics, map, and report are still being built. The final result
+    tuple is the generator's return value.
+    """
 
     start_time = time.time()
 
@@ -320,12 +360,25 @@ def process_curve_numbers(
                 "layer in the Input Data tab (tab 1), or also enable CN "
                 "generation from your own data (tab 3)."))
 
+        # Start every layer read up front. GDAL releases the GIL while it
+        # reads, so the uploads load side by side instead of one after another.
+        read_pool = ThreadPoolExecutor(max_workers=3)
+        watershed_future = soil_future = landuse_future = None
+        if watershed_file is not None:
+            logger.log(f"Reading watershed boundary layer: {watershed_file.name}")
+            watershed_future = read_pool.submit(read_vector_layer, watershed_file.name)
+        if run_user_cn:
+            logger.log(f"Reading soil layer: {soil_file.name}")
+            soil_future = read_pool.submit(read_vector_layer, soil_file.name)
+            logger.log(f"Reading land use layer: {landuse_file.name}")
+            landuse_future = read_pool.submit(read_vector_layer, landuse_file.name)
+        read_pool.shutdown(wait=False)
+
         # Load the watershed layer once; both workflows can use it
         watershed_gdf = None
-        if watershed_file is not None:
+        if watershed_future is not None:
             try:
-                logger.log(f"Reading watershed boundary layer: {watershed_file.name}")
-                watershed_gdf = gpd.read_file(watershed_file.name)
+                watershed_gdf = watershed_future.result()
                 logger.log(f"Watershed layer loaded: {len(watershed_gdf)} polygons")
             except Exception as e:
                 logger.log(f"ERROR reading watershed file: {str(e)}")
@@ -344,16 +397,14 @@ def process_curve_numbers(
             # from the actual extent when the user asks for automatic.
             update_progress(progress, 0.10, "Loading soil and land use layers", logger)
             try:
-                logger.log(f"Reading soil layer: {soil_file.name}")
-                soil_gdf = gpd.read_file(soil_file.name)
+                soil_gdf = soil_future.result()
                 logger.log(f"Soil layer loaded: {len(soil_gdf)} polygons")
             except Exception as e:
                 logger.log(f"ERROR reading soil file: {str(e)}")
                 return build_result(status_message=f"Error reading soil file: {str(e)}")
 
             try:
-                logger.log(f"Reading land use layer: {landuse_file.name}")
-                landuse_gdf = gpd.read_file(landuse_file.name)
+                landuse_gdf = landuse_future.result()
                 logger.log(f"Land use layer loaded: {len(landuse_gdf)} polygons")
             except Exception as e:
                 logger.log(f"ERROR reading land use file: {str(e)}")
@@ -384,13 +435,22 @@ def process_curve_numbers(
                 'C/D': replacement_cd
             }
 
-            # Count missing hydrogroup values before preprocessing
-            original_soil_gdf = soil_gdf.copy()
+            # Count missing hydrogroup values before preprocessing. Only the
+            # one column is needed, so the layer itself is not copied.
             valid_groups = ['A', 'B', 'C', 'D', 'A/D', 'B/D', 'C/D']
-            missing_hydrogroup_count = (~original_soil_gdf[hydgrp_field].isin(valid_groups)).sum()
+            missing_hydrogroup_count = int(
+                (~soil_gdf[hydgrp_field].isin(valid_groups)).to_numpy().sum()
+            )
 
-            soil_gdf = calc.preprocess_soil_data(soil_gdf, hydgrp_field, replacements)
-            landuse_gdf = calc.preprocess_landuse_data(landuse_gdf, code_field)
+            # When both layers share a CRS other than the target, intersect
+            # them as they are and reproject only the intersection pieces
+            defer_reproject = calc.shares_source_crs(soil_gdf, landuse_gdf)
+            soil_gdf = calc.preprocess_soil_data(
+                soil_gdf, hydgrp_field, replacements, skip_reproject=defer_reproject
+            )
+            landuse_gdf = calc.preprocess_landuse_data(
+                landuse_gdf, code_field, skip_reproject=defer_reproject
+            )
 
             # Compute intersection
             update_progress(progress, 0.36, "Intersecting soil and land use polygons", logger)
@@ -408,6 +468,16 @@ def process_curve_numbers(
             update_progress(progress, 0.52, "Dissolving polygons by curve number", logger)
             dissolved_gdf = calc.dissolve_by_cn(cn_gdf)
 
+            # Save the CN polygons in the run's results folder on a worker
+            # thread. Nothing later in the run reads the file, so the write
+            # overlaps building and clipping the raster below.
+            vector_path = str(run_dir / "cn_polygons.gpkg")
+            vector_pool = ThreadPoolExecutor(max_workers=1)
+            vector_future = vector_pool.submit(
+                save_cn_polygons, dissolved_gdf, vector_path
+            )
+            vector_pool.shutdown(wait=False)
+
             # Create raster in this run's results folder
             raster_path = str(run_dir / "cn_raster.tif")
 
@@ -424,6 +494,21 @@ def process_curve_numbers(
                 SpatialOperations.clip_raster_to_boundary(raster_path, watershed_gdf)
                 logger.log("CN raster clipped to the watershed boundary")
 
+            # The CN polygons were written in the background while the raster
+            # was built; wait for them and hand both files to the interface
+            # before the statistics, map, and report work starts.
+            try:
+                vector_future.result()
+                logger.log(f"CN polygons saved: {vector_path}")
+            except Exception as e:
+                logger.log(f"Error saving vector file: {str(e)}")
+                vector_path = None
+            yield build_result(
+                vector_path=vector_path,
+                raster_path=raster_path,
+                status_message="CN polygons and raster are ready. Statistics, map, and report are still being built.",
+            )
+
             # Calculate statistics
             update_progress(progress, 0.64, "Calculating summary statistics", logger)
             global_stats = CNStatistics.calculate_global_stats(dissolved_gdf)
@@ -520,17 +605,6 @@ def process_curve_numbers(
 
         # The summary report is shown in the app only; it is not saved to disk
 
-        # Save the CN polygons in the run's results folder
-        if dissolved_gdf is not None:
-            vector_path = str(run_dir / "cn_polygons.gpkg")
-            try:
-                update_progress(progress, 0.97, "Saving downloadable files", logger)
-                dissolved_gdf.to_file(vector_path, driver='GPKG')
-                logger.log(f"CN polygons saved: {vector_path}")
-            except Exception as e:
-                logger.log(f"Error saving vector file: {str(e)}")
-                vector_path = None
-
         # Calculate total processing time
         end_time = time.time()
         processing_time = end_time - start_time
@@ -616,7 +690,7 @@ def process_data_preparation(
     try:
         update_progress(progress, 0.02, "Reading the watershed boundary", logger)
         watershed_path = getattr(watershed_file, "name", watershed_file)
-        watershed_gdf = gpd.read_file(watershed_path)
+        watershed_gdf = read_vector_layer(watershed_path)
         logger.log(f"Watershed layer loaded: {len(watershed_gdf)} polygons")
 
         soil_info = None
@@ -1513,13 +1587,38 @@ def create_interface():
                 gr.Tabs(selected="results"),  # switch to the Results tab
             )
 
-            # Run the actual processing
-            results = process_curve_numbers(*args, progress=progress)
-            (vector_path, raster_path, report_html, map_html, excel_path,
-             gcn10_raster_path, gcn10_csv_path, time_display) = results
+            # Run the actual processing, showing each file as soon as it is
+            # ready. Outputs that are not ready yet are left unchanged.
+            run = process_curve_numbers(*args, progress=progress)
+            shown = [None] * 7
+            while True:
+                try:
+                    partial = next(run)
+                except StopIteration as finished:
+                    results = finished.value
+                    break
+                shown = [value if value is not None else kept
+                         for value, kept in zip(partial[:7], shown)]
+                yield tuple(
+                    gr.update() if value is None else gr.update(value=value, visible=True)
+                    for value in partial[:7]
+                ) + (
+                    gr.update(value=f'<div class="processing-status">{partial[7]}</div>', visible=True),
+                    gr.update(),  # keep the current tab selection
+                )
+
+            # A failed run returns every output as None, so success is read
+            # from the final result before files already on screen are merged
+            # back in
+            succeeded = results[0] is not None or results[5] is not None
 
-            # Anything produced this run gets shown; the rest stays hidden
-            succeeded = vector_path is not None or gcn10_raster_path is not None
+            # Files that were already handed to the interface stay on screen
+            (vector_path, raster_path, report_html, map_html, excel_path,
+             gcn10_raster_path, gcn10_csv_path) = [
+                value if value is not None else kept
+                for value, kept in zip(results[:7], shown)
+            ]
+            time_display = results[7]
             status_class = "processing-status processing-complete" if succeeded else "processing-status processing-error"
 
             # Return final results
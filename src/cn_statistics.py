@@ -8,15 +8,12 @@ import pandas as pd
 import numpy as np
 import rasterio
 from typing import Dict, List, Optional
-import warnings
 
 try:
     from .zonal_exact import exact_zonal_stats
 except ImportError:  # when imported as a top-level module
     from zonal_exact import exact_zonal_stats
 
-warnings.filterwarnings('ignore')
-
 class CNStatistics:
     """Calculate statistics for Curve Number distributions."""
     
@@ -34,47 +31,70 @@ class CNStatistics:
         --------
         dict : Statistics dictionary
         """
-        # Filter valid CN values
-        valid_cn = cn_gdf[cn_gdf['CN'].notna()]['CN']
+        # Pull the valid CN values out once as a plain array; every
+        # statistic below is a single numpy pass over it
+        valid = cn_gdf['CN'].notna().to_numpy()
+        cn = cn_gdf['CN'].to_numpy()[valid]
+        count = cn.size
+        has_area = 'area_ha' in cn_gdf.columns
+        percentiles = [25, 50, 90]
+        minimum = cn.min() if count else np.nan
+        maximum = cn.max() if count else np.nan
         
-        if 'area_ha' in cn_gdf.columns:
-            # Weighted statistics by area
-            weights = cn_gdf[cn_gdf['CN'].notna()]['area_ha']
-            weighted_mean = np.average(valid_cn, weights=weights)
-            
-            stats = {
-                'count': len(valid_cn),
-                'min': valid_cn.min(),
-                'max': valid_cn.max(),
-                'mean': valid_cn.mean(),
-                'weighted_mean': weighted_mean,
-                'median': valid_cn.median(),
-                'std': valid_cn.std(),
-                'unique_values': len(valid_cn.unique())
-            }
-            
-            # Add distribution percentiles (excluding 10 and 75 as requested)
-            percentiles = [25, 50, 90]
-            for p in percentiles:
-                stats[f'percentile_{p}'] = np.percentile(valid_cn, p)
+        if count == 0 or minimum == maximum:
+            # Empty or constant CN (common for small test watersheds): every
+            # location statistic is the one value, or NaN when empty, so the
+            # sort, the spread, and the weighted pass can all be skipped
+            value = np.float64(minimum)
+            mean = weighted_mean = value
+            std = np.float64(0.0) if count > 1 else np.nan
+            quantiles = [value] * len(percentiles)
+            unique_values = int(count > 0)
         else:
-            stats = {
-                'count': len(valid_cn),
-                'min': valid_cn.min(),
-                'max': valid_cn.max(),
-                'mean': valid_cn.mean(),
-                'median': valid_cn.median(),
-                'std': valid_cn.std(),
-                'unique_values': len(valid_cn.unique())
-            }
-        
-        return stats
+            mean = cn.sum(dtype=np.float64) / count
+            # Sample standard deviation (ddof=1), as pandas reports it
+            std = np.sqrt(((cn - mean) ** 2).sum() / (count - 1))
+            # One sort serves the median and every percentile
+            quantiles = np.percentile(cn, percentiles)
+            unique_values = np.unique(cn).size
+            if has_area:
+                # Weighted statistics by area
+                weights = cn_gdf['area_ha'].to_numpy()[valid]
+                # Zero total area gives NaN; that is expected, not a warning
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    weighted_mean = (cn * weights).sum() / weights.sum()
+        
+        stats = {
+            'count': count,
+            'min': minimum,
+            'max': maximum,
+            'mean': mean
+        }
+        if has_area:
+            stats['weighted_mean'] = weighted_mean
+        stats['median'] = quantiles[1]
+        stats['std'] = std
+        stats['unique_values'] = unique_values
+        
+        if has_area:
+            # Add distribution percentiles (excluding 10 and 75 as requested)
+            for p, value in zip(percentiles, quantiles):
+                stats[f'percentile_{p}'] = value
+        
+        # Hand back plain Python numbers. numpy integer scalars are not
+        # int instances, so an integer CN column's min and max used to be
+        # skipped by the report, and numpy scalars do not JSON-encode.
+        return {
+            key: int(value) if key in ('count', 'unique_values') else float(value)
+            for key, value in stats.items()
+        }
     
     @staticmethod
     def calculate_zonal_statistics(cn_raster_path: str,
                                   watershed_gdf: gpd.GeoDataFrame,
                                   watershed_field: str,
-                                  nodata: float = 0) -> pd.DataFrame:
+                                  nodata: float = 0,
+                                  use_parallel: bool = True) -> pd.DataFrame:
         """
         Calculate zonal statistics for watersheds.
 
@@ -95,6 +115,9 @@ class CNStatistics:
         nodata : float
             NoData value of the raster (0 for app-generated CN rasters,
             255 for GCN10 rasters)
+        use_parallel : bool
+            Summarize watersheds on several threads (default). Set to False
+            to run them one after another.
 
         Returns:
         --------
@@ -106,8 +129,14 @@ class CNStatistics:
         with rasterio.open(cn_raster_path) as src:
             raster_crs = src.crs
 
-        # Reproject watersheds if needed
-        if watershed_gdf.crs != raster_crs:
+        # Reproject watersheds only when the CRS really differs. CRS.equals
+        # treats a WKT and its EPSG code (and axis-order variants) as the
+        # same system, which a plain != comparison does not.
+        same_crs = (
+            watershed_gdf.crs is not None and raster_crs is not None
+            and watershed_gdf.crs.equals(raster_crs.to_wkt(), ignore_axis_order=True)
+        )
+        if not same_crs:
             print(f"Reprojecting watersheds to match raster CRS")
             watershed_gdf = watershed_gdf.to_crs(raster_crs)
 
@@ -117,23 +146,25 @@ class CNStatistics:
             cn_raster_path,
             list(watershed_gdf.geometry),
             nodata=nodata,
+            max_workers=None if use_parallel else 1,
         )
 
-        # Create results dataframe, keeping the columns the rest of the app uses
-        results = pd.DataFrame(stats_list)[['min', 'max', 'mean', 'median', 'std']]
-        results[watershed_field] = watershed_gdf[watershed_field].values
+        # Build the results in their final column order straight from numpy
+        # arrays, keeping the columns the rest of the app uses
+        columns = {watershed_field: watershed_gdf[watershed_field].to_numpy()}
+        for key in ('min', 'max', 'mean', 'median', 'std'):
+            columns[key] = np.array([stats[key] for stats in stats_list], dtype=np.float64)
         
         # Calculate additional statistics
-        results['cv'] = (results['std'] / results['mean']) * 100  # Coefficient of variation
-        results['range'] = results['max'] - results['min']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            columns['cv'] = columns['std'] / columns['mean'] * 100  # Coefficient of variation
+        columns['range'] = columns['max'] - columns['min']
         
-        # Reorder columns
-        cols = [watershed_field] + [col for col in results.columns if col != watershed_field]
-        results = results[cols]
+        # Round the statistics (the ID column is left as is)
+        for key in list(columns)[1:]:
+            columns[key] = columns[key].round(2)
         
-        # Round numeric columns
-        numeric_cols = results.select_dtypes(include=[np.number]).columns
-        results[numeric_cols] = results[numeric_cols].round(2)
+        results = pd.DataFrame(columns)
         
         print(f"Calculated statistics for {len(results)} watersheds")
         
@@ -199,13 +230,48 @@ class CNStatistics:
         --------
         DataFrame : Distribution of CN values
         """
-        # Group by CN value
-        if 'area_ha' in cn_gdf.columns:
-            distribution = cn_gdf.groupby('CN').agg({
-                'area_ha': 'sum',
-                'geometry': 'count'
-            }).rename(columns={'geometry': 'polygon_count'})
+        has_area = 'area_ha' in cn_gdf.columns
+        
+        # Missing CN values are left out, as a groupby would drop them
+        valid = cn_gdf['CN'].notna().to_numpy()
+        cn = cn_gdf['CN'].to_numpy()[valid]
+        
+        if cn.size > 0 and cn.min() >= 0 and cn.max() <= 255 and np.all(cn == np.floor(cn)):
+            # Whole-number CN (the normal case): one np.bincount sweep sums
+            # the area and counts the polygons per value, no hash table
+            bins = cn.astype(np.int64)
+            counts = np.bincount(bins)
+            present = np.flatnonzero(counts)
+            columns = {}
+            if has_area:
+                areas = cn_gdf['area_ha'].to_numpy(dtype=np.float64)[valid]
+                columns['area_ha'] = np.bincount(bins, weights=areas)[present]
+                columns['polygon_count'] = counts[present]
+            else:
+                columns['count'] = counts[present]
+            distribution = pd.DataFrame(
+                columns, index=pd.Index(present.astype(cn.dtype), name='CN')
+            )
+        else:
+            # Fractional CN from a custom lookup table: group on Categorical
+            # integer codes instead of hashing every row's value
+            cn_groups = pd.Categorical(cn_gdf['CN'])
+            if has_area:
+                # Count rows with the group size rather than by counting the
+                # geometry column, which would walk every shapely object
+                distribution = cn_gdf['area_ha'].groupby(cn_groups, observed=True).agg(
+                    area_ha='sum',
+                    polygon_count='size'
+                )
+            else:
+                distribution = cn_gdf.groupby(cn_groups, observed=True).size().to_frame('count')
             
+            # Hand back plain CN values, not categories
+            distribution.index = pd.Index(
+                distribution.index.astype(cn_gdf['CN'].dtype), name='CN'
+            )
+        
+        if has_area:
             # Calculate percentages
             total_area = distribution['area_ha'].sum()
             distribution['area_percent'] = (distribution['area_ha'] / total_area * 100).round(2)
@@ -213,7 +279,6 @@ class CNStatistics:
             # Add cumulative percentage
             distribution['cumulative_percent'] = distribution['area_percent'].cumsum()
         else:
-            distribution = cn_gdf.groupby('CN').size().to_frame('count')
             distribution['percent'] = (distribution['count'] / distribution['count'].sum() * 100).round(2)
         
         distribution = distribution.reset_index()
@@ -234,19 +299,18 @@ class CNStatistics:
         --------
         Series : Classification labels
         """
-        conditions = [
-            cn_values < 40,
-            (cn_values >= 40) & (cn_values < 60),
-            (cn_values >= 60) & (cn_values < 80),
-            cn_values >= 80
-        ]
-        
-        choices = [
+        # One pass: np.digitize maps each value to its bin (<40, 40-60,
+        # 60-80, >=80), which then indexes the label array. NaN would land
+        # in the top bin, so it is labelled 'Unknown' explicitly.
+        values = cn_values.to_numpy(dtype=float)
+        labels = np.array([
             'Low Runoff Potential',
             'Moderate Runoff Potential', 
             'High Runoff Potential',
-            'Very High Runoff Potential'
-        ]
+            'Very High Runoff Potential',
+            'Unknown'
+        ])
+        bins = np.digitize(values, [40, 60, 80])
+        bins[np.isnan(values)] = len(labels) - 1
         
-        return pd.Series(np.select(conditions, choices, default='Unknown'), 
-                        index=cn_values.index)
+        return pd.Series(labels[bins], index=cn_values.index)
@@ -6,13 +6,58 @@ Handles the core CN calculation logic using open-source geospatial libraries
 import geopandas as gpd
 import pandas as pd
 import numpy as np
+import shapely
 from shapely.geometry import box
-import warnings
+from shapely.errors import GEOSException
+from pyproj import CRS
 from multiprocessing import Pool, cpu_count
-from functools import partial
+from functools import partial, lru_cache
+import os
 from typing import Optional, Tuple, Dict, Any
 
-warnings.filterwarnings('ignore')
+@lru_cache(maxsize=2)
+def _read_lookup_csv(lookup_path: str, mtime: float, size: int) -> pd.DataFrame:
+    """Parse a custom lookup CSV once per (path, mtime, size)."""
+    return pd.read_csv(lookup_path)
+
+
+# NLCD lookup table, built once at import; see _get_nlcd_lookup
+_NLCD_LOOKUP_DF = pd.DataFrame({
+        'LUValue': [11, 21, 22, 23, 24, 31, 41, 42, 43, 52, 71, 81, 82, 90, 95],
+        'Description': [
+            'Open Water', 'Developed, Open Space', 'Developed, Low Intensity', 
+            'Developed, Medium Intensity', 'Developed, High Intensity', 
+            'Barren Land (Rock/Sand/Clay)', 'Deciduous Forest', 'Evergreen Forest',
+            'Mixed Forest', 'Shrub/Scrub', 'Grassland/Herbaceous', 'Pasture/Hay',
+            'Cultivated Crops', 'Woody Wetlands', 'Emergent Herbaceous Wetlands'
+        ],
+        'A': [98, 49, 57, 61, 81, 78, 45, 25, 36, 55, 50, 49, 67, 30, 30],
+        'B': [98, 69, 72, 75, 88, 86, 66, 55, 60, 72, 69, 69, 78, 58, 58],
+        'C': [98, 79, 81, 83, 91, 91, 77, 70, 73, 81, 79, 79, 85, 71, 71],
+        'D': [98, 84, 86, 87, 93, 93, 83, 77, 79, 86, 84, 84, 89, 78, 78]
+})
+
+
+def _long_cn_lookup(lookup_df: pd.DataFrame) -> pd.Series:
+    """
+    Melt a lookup table into one CN per (land use code, soil group) pair.
+
+    On duplicate pairs the last row wins, as it did with the old per-row
+    dictionary.
+    """
+    groups = [hg for hg in ['A', 'B', 'C', 'D'] if hg in lookup_df.columns]
+    melted = lookup_df.melt(
+        id_vars='LUValue', value_vars=groups, var_name='HG', value_name='CN'
+    ).drop_duplicates(['LUValue', 'HG'], keep='last')
+    return pd.Series(
+        melted['CN'].to_numpy(),
+        index=pd.MultiIndex.from_arrays([melted['LUValue'], melted['HG']])
+    )
+
+
+# Long form of the NLCD table, reused by assign_curve_numbers
+_NLCD_LOOKUP_LONG = _long_cn_lookup(_NLCD_LOOKUP_DF)
+
 
 class CurveNumberCalculator:
     """
@@ -34,9 +79,51 @@ class CurveNumberCalculator:
             Enable parallel processing for large datasets (currently not implemented for overlay)
         """
         self.crs = crs
+        # Parsed target CRS and its EPSG code, used to skip reprojection of
+        # layers that are already in it (EPSG is None when there is no code)
+        self.crs_obj = CRS.from_user_input(crs)
+        self.target_epsg = self.crs_obj.to_epsg()
         self.use_parallel = use_parallel
         self.n_cores = cpu_count() - 1 if use_parallel else 1
         
+    def _in_target_crs(self, gdf: gpd.GeoDataFrame) -> bool:
+        """
+        Check whether a layer is already in the calculator's CRS.
+
+        The CRS objects are compared first, against the target parsed once
+        in __init__. A shapefile .prj often carries an ESRI flavor of the
+        same WKT, which that comparison may not treat as equal, so the EPSG
+        codes are checked next; otherwise every vertex would be reprojected
+        for nothing.
+        """
+        if gdf.crs is None:
+            return False
+        if gdf.crs.equals(self.crs_obj, ignore_axis_order=True):
+            return True
+        return self.target_epsg is not None and gdf.crs.to_epsg() == self.target_epsg
+
+    def shares_source_crs(self, soil_gdf: gpd.GeoDataFrame,
+                          landuse_gdf: gpd.GeoDataFrame) -> bool:
+        """
+        Check whether both layers arrive in one common CRS other than the
+        target CRS.
+
+        They can then be intersected in that CRS and only the intersection
+        pieces reprojected (see the skip_reproject flags of the preprocess
+        steps), instead of reprojecting every vertex of both inputs.
+
+        The result is not bit-identical to reprojecting first. Polygon edges
+        are straight in the CRS the intersection runs in, so edge crossings
+        land in slightly different places. Areas (and so area_ha after the
+        dissolve) can shift by a few hundredths of a percent. A piece may
+        also split differently, e.g. a Polygon where the eager path yields
+        a MultiPolygon.
+        """
+        if soil_gdf.crs is None or landuse_gdf.crs is None:
+            return False
+        return (soil_gdf.crs.equals(landuse_gdf.crs, ignore_axis_order=True)
+                and not self._in_target_crs(soil_gdf))
+
     def load_lookup_table(self, lookup_path: str = None, use_nlcd: bool = True) -> pd.DataFrame:
         """
         Load the CN lookup table.
@@ -53,7 +140,8 @@ class CurveNumberCalculator:
         pd.DataFrame : Lookup table with land use codes and CN values
         """
         if lookup_path:
-            lookup_df = pd.read_csv(lookup_path)
+            stat = os.stat(lookup_path)
+            lookup_df = _read_lookup_csv(lookup_path, stat.st_mtime, stat.st_size).copy()
             print(f"Loaded custom lookup table from {lookup_path}")
         elif use_nlcd:
             # Default NLCD lookup table structure
@@ -73,24 +161,11 @@ class CurveNumberCalculator:
         
         Reference: HEC-HMS User's Manual and official USACE documentation
         """
-        data = {
-            'LUValue': [11, 21, 22, 23, 24, 31, 41, 42, 43, 52, 71, 81, 82, 90, 95],
-            'Description': [
-                'Open Water', 'Developed, Open Space', 'Developed, Low Intensity', 
-                'Developed, Medium Intensity', 'Developed, High Intensity', 
-                'Barren Land (Rock/Sand/Clay)', 'Deciduous Forest', 'Evergreen Forest',
-                'Mixed Forest', 'Shrub/Scrub', 'Grassland/Herbaceous', 'Pasture/Hay',
-                'Cultivated Crops', 'Woody Wetlands', 'Emergent Herbaceous Wetlands'
-            ],
-            'A': [98, 49, 57, 61, 81, 78, 45, 25, 36, 55, 50, 49, 67, 30, 30],
-            'B': [98, 69, 72, 75, 88, 86, 66, 55, 60, 72, 69, 69, 78, 58, 58],
-            'C': [98, 79, 81, 83, 91, 91, 77, 70, 73, 81, 79, 79, 85, 71, 71],
-            'D': [98, 84, 86, 87, 93, 93, 83, 77, 79, 86, 84, 84, 89, 78, 78]
-        }
-        return pd.DataFrame(data)
+        return _NLCD_LOOKUP_DF.copy()
     
     def preprocess_soil_data(self, soil_gdf: gpd.GeoDataFrame, hydgrp_field: str,
-                           replacements: Dict[str, str]) -> gpd.GeoDataFrame:
+                           replacements: Dict[str, str],
+                           skip_reproject: bool = False) -> gpd.GeoDataFrame:
         """
         Preprocess soil data and handle dual hydrologic groups.
         
@@ -102,36 +177,60 @@ class CurveNumberCalculator:
             Field name containing hydrologic group codes
         replacements : dict
             Replacement mapping for dual groups (e.g., {'A/D': 'D'})
+        skip_reproject : bool
+            Keep the layer in its own CRS; compute_intersection reprojects
+            the result instead
             
         Returns:
         --------
         GeoDataFrame : Preprocessed soil data
         """
-        soil_gdf = soil_gdf.copy()
-        
-        # Ensure consistent CRS
-        if soil_gdf.crs != self.crs:
+        # Ensure consistent CRS. Otherwise work on a shallow copy: the
+        # geometry and other columns are shared with the input, and only
+        # the hydrologic group column is replaced.
+        if not skip_reproject and not self._in_target_crs(soil_gdf):
             print(f"Reprojecting soil data from {soil_gdf.crs} to {self.crs}")
-            soil_gdf = soil_gdf.to_crs(self.crs)
-        
-        # Handle dual hydrologic groups
+            soil_gdf = soil_gdf.to_crs(self.crs_obj)
+        else:
+            soil_gdf = soil_gdf.copy(deep=False)
+        
+        # Handle dual hydrologic groups. A soil layer only holds a handful of
+        # distinct codes, so replace those and broadcast back to the rows in
+        # one pass instead of scanning every row once per dual group.
+        codes, uniques = pd.factorize(soil_gdf[hydgrp_field])
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        position = {value: i for i, value in enumerate(uniques)}
+        new_uniques = np.array(uniques, dtype=object)
+        replaced = False
         for dual_group, replacement in replacements.items():
-            mask = soil_gdf[hydgrp_field] == dual_group
-            soil_gdf.loc[mask, hydgrp_field] = replacement
-            if mask.sum() > 0:
-                print(f"Replaced {mask.sum()} occurrences of '{dual_group}' with '{replacement}'")
-        
-        # Validate hydrologic groups
+            i = position.get(dual_group)
+            if i is not None and counts[i] > 0:
+                new_uniques[i] = replacement
+                replaced = True
+                print(f"Replaced {counts[i]} occurrences of '{dual_group}' with '{replacement}'")
+        if replaced:
+            values = new_uniques[codes]
+            values[codes < 0] = None  # keep missing codes missing
+            soil_gdf[hydgrp_field] = values
+        
+        # Validate hydrologic groups on the same distinct codes; missing
+        # values count as invalid, as isin would treat them
         valid_groups = ['A', 'B', 'C', 'D']
-        invalid_mask = ~soil_gdf[hydgrp_field].isin(valid_groups)
-        if invalid_mask.sum() > 0:
-            print(f"Warning: {invalid_mask.sum()} features have invalid hydrologic groups")
-            print(f"   Invalid values: {soil_gdf.loc[invalid_mask, hydgrp_field].unique()}")
+        invalid = ~pd.Index(new_uniques).isin(valid_groups)
+        missing_count = int((codes < 0).sum())
+        invalid_count = int(counts[invalid].sum()) + missing_count
+        if invalid_count > 0:
+            invalid_values = pd.unique(new_uniques[invalid & (counts > 0)])
+            if missing_count:
+                invalid_values = np.append(invalid_values, None)
+            print(f"Warning: {invalid_count} features have invalid hydrologic groups")
+            print(f"   Invalid values: {invalid_values}")
         
         return soil_gdf
     
     def preprocess_landuse_data(self, landuse_gdf: gpd.GeoDataFrame, 
-                               code_field: str) -> gpd.GeoDataFrame:
+                               code_field: str,
+                               skip_reproject: bool = False) -> gpd.GeoDataFrame:
         """
         Preprocess land use data.
         
@@ -141,17 +240,22 @@ class CurveNumberCalculator:
             Land use shapefile data
         code_field : str
             Field name containing land use codes
+        skip_reproject : bool
+            Keep the layer in its own CRS; compute_intersection reprojects
+            the result instead
             
         Returns:
         --------
         GeoDataFrame : Preprocessed land use data
         """
-        landuse_gdf = landuse_gdf.copy()
-        
-        # Ensure consistent CRS
-        if landuse_gdf.crs != self.crs:
+        # Ensure consistent CRS. Otherwise work on a shallow copy: the
+        # geometry and other columns are shared with the input, and only
+        # the code column is replaced.
+        if not skip_reproject and not self._in_target_crs(landuse_gdf):
             print(f"Reprojecting land use data from {landuse_gdf.crs} to {self.crs}")
-            landuse_gdf = landuse_gdf.to_crs(self.crs)
+            landuse_gdf = landuse_gdf.to_crs(self.crs_obj)
+        else:
+            landuse_gdf = landuse_gdf.copy(deep=False)
         
         # Ensure land use codes are integers
         try:
@@ -161,13 +265,94 @@ class CurveNumberCalculator:
         
         return landuse_gdf
     
+    # shapely type ids for Polygon and MultiPolygon
+    _POLYGONAL_TYPE_IDS = (3, 6)
+    
+    @classmethod
+    def _make_valid(cls, gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+        """
+        Repair invalid geometries with make_valid, as gpd.overlay does.
+        
+        buffer(0) is not used: it keeps only one lobe of a self-crossing
+        (bow-tie) polygon. Any lines or points make_valid splits off are
+        dropped, so only the polygonal area remains.
+        """
+        invalid = ~gdf.geometry.is_valid
+        if invalid.any():
+            gdf = gdf.copy()
+            gdf.loc[invalid, gdf.geometry.name] = cls._polygonal_parts(
+                shapely.make_valid(gdf.geometry.to_numpy()[invalid.to_numpy()])
+            )
+        return gdf
+    
+    @classmethod
+    def _polygonal_parts(cls, geoms: np.ndarray) -> np.ndarray:
+        """
+        Reduce geometry collections to their polygonal parts.
+        
+        Two polygons that share an edge as well as an area intersect in a
+        GeometryCollection; keep its polygons so the area is not lost.
+        """
+        geoms = geoms.copy()
+        for i in np.flatnonzero(shapely.get_type_id(geoms) == 7):
+            parts = shapely.get_parts(geoms[i])
+            polygons = parts[np.isin(shapely.get_type_id(parts), cls._POLYGONAL_TYPE_IDS)]
+            geoms[i] = shapely.union_all(polygons) if len(polygons) else None
+        return geoms
+    
+    @classmethod
+    def _is_polygonal(cls, geoms: np.ndarray) -> np.ndarray:
+        """True for non-empty Polygon and MultiPolygon entries."""
+        return np.isin(shapely.get_type_id(geoms), cls._POLYGONAL_TYPE_IDS) \
+            & ~shapely.is_empty(geoms)
+    
+    @classmethod
+    def _uncovered_parts(cls, geoms: np.ndarray, other_geoms: np.ndarray,
+                         idx: np.ndarray, other_idx: np.ndarray) -> np.ndarray:
+        """
+        Subtract from each geometry the other-layer geometries it intersects.
+        
+        idx/other_idx are the intersecting pairs from the tree query.
+        Geometries with no partner are returned unchanged.
+        """
+        remainder = geoms.copy()
+        for i, partners in pd.Series(other_idx).groupby(idx):
+            remainder[i] = shapely.difference(
+                geoms[i], shapely.union_all(other_geoms[partners.to_numpy()])
+            )
+        return cls._polygonal_parts(remainder)
+    
+    @staticmethod
+    def _hilbert_sorted(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+        """Return gdf reordered along a Hilbert curve, dropping null/empty geometries."""
+        geom = gdf.geometry
+        gdf = gdf[geom.notna() & ~geom.is_empty]
+        if len(gdf) < 2:
+            return gdf
+        return gdf.iloc[np.argsort(gdf.geometry.hilbert_distance().to_numpy(), kind='stable')]
+    
     def compute_intersection(self, soil_gdf: gpd.GeoDataFrame, 
                            landuse_gdf: gpd.GeoDataFrame,
                            hydgrp_field: str, 
-                           code_field: str) -> gpd.GeoDataFrame:
+                           code_field: str,
+                           how: str = 'intersection',
+                           target_crs: Optional[str] = None) -> gpd.GeoDataFrame:
         """
         Compute spatial intersection of soil and land use layers.
         
+        With how='identity' the soil areas not covered by any land use
+        polygon are kept as well, with a missing land use code; 'union'
+        also keeps land use areas outside the soil layer, with a missing
+        soil group. Those extra pieces get no CN and end up as NoData. They
+        are built as intersection plus difference, which is far cheaper
+        than an overlay union.
+        
+        Both layers must share one CRS. When they were preprocessed with
+        skip_reproject, the pieces are reprojected to the target CRS at the
+        end; they carry fewer vertices than the two inputs combined. Areas
+        can then differ slightly from reprojecting first; see
+        shares_source_crs.
+        
         Parameters:
         -----------
         soil_gdf : GeoDataFrame
@@ -178,24 +363,85 @@ class CurveNumberCalculator:
             Soil hydrologic group field
         code_field : str
             Land use code field
+        how : str
+            'intersection' (default), 'identity', or 'union'
+        target_crs : str, optional
+            CRS of the returned polygons (defaults to the calculator's CRS)
             
         Returns:
         --------
-        GeoDataFrame : Intersection with both soil and land use attributes
+        GeoDataFrame : Intersection polygons with the soil group and land use
+            code fields
         """
-        print("Computing spatial intersection (this may take a while for large datasets)...")
+        if how not in ('intersection', 'identity', 'union'):
+            raise ValueError(f"Unsupported overlay mode: {how}")
         
-        # Use standard geopandas overlay - it's already optimized
-        intersection_gdf = gpd.overlay(soil_gdf, landuse_gdf, how='intersection')
+        print("Computing spatial intersection (this may take a while for large datasets)...")
         
-        # Clean up column names
-        if f'{hydgrp_field}_1' in intersection_gdf.columns:
-            intersection_gdf[hydgrp_field] = intersection_gdf[f'{hydgrp_field}_1']
-            intersection_gdf = intersection_gdf.drop(columns=[f'{hydgrp_field}_1', f'{hydgrp_field}_2'], errors='ignore')
+        # Only the two attributes the CN lookup needs travel with the
+        # geometries; invalid polygons are repaired the way gpd.overlay does
+        soil_gdf = self._make_valid(soil_gdf[[hydgrp_field, soil_gdf.geometry.name]])
+        landuse_gdf = self._make_valid(landuse_gdf[[code_field, landuse_gdf.geometry.name]])
+        
+        # Sort both layers along a Hilbert curve so neighbouring polygons sit
+        # next to each other: soil is queried against an STR tree built on
+        # land use, and both the tree packing and query locality improve.
+        soil_gdf = self._hilbert_sorted(soil_gdf)
+        landuse_gdf = self._hilbert_sorted(landuse_gdf)
+        
+        # One bulk STR tree query finds every intersecting (soil, land use)
+        # pair, then GEOS intersects all pairs in a single vectorized call
+        soil_geoms = soil_gdf.geometry.to_numpy()
+        landuse_geoms = landuse_gdf.geometry.to_numpy()
+        soil_idx, landuse_idx = landuse_gdf.sindex.query(soil_geoms, predicate='intersects')
+        geoms = self._polygonal_parts(
+            shapely.intersection(soil_geoms[soil_idx], landuse_geoms[landuse_idx])
+        )
+        
+        # Keep non-empty polygonal pieces only; pairs that merely touch
+        # along an edge or at a point are dropped, as gpd.overlay does
+        keep = self._is_polygonal(geoms)
+        intersection_gdf = gpd.GeoDataFrame(
+            {
+                hydgrp_field: soil_gdf[hydgrp_field].to_numpy()[soil_idx[keep]],
+                code_field: landuse_gdf[code_field].to_numpy()[landuse_idx[keep]],
+            },
+            geometry=geoms[keep],
+            crs=soil_gdf.crs,
+        )
+        
+        if how != 'intersection':
+            pieces = [intersection_gdf]
+            
+            # Soil left over after removing the land use it overlaps
+            remainder = self._uncovered_parts(soil_geoms, landuse_geoms, soil_idx, landuse_idx)
+            keep = self._is_polygonal(remainder)
+            pieces.append(gpd.GeoDataFrame(
+                {hydgrp_field: soil_gdf[hydgrp_field].to_numpy()[keep]},
+                geometry=remainder[keep],
+                crs=soil_gdf.crs,
+            ))
+            
+            if how == 'union':
+                # Land use left over after removing the soil it overlaps
+                remainder = self._uncovered_parts(landuse_geoms, soil_geoms, landuse_idx, soil_idx)
+                keep = self._is_polygonal(remainder)
+                pieces.append(gpd.GeoDataFrame(
+                    {code_field: landuse_gdf[code_field].to_numpy()[keep]},
+                    geometry=remainder[keep],
+                    crs=soil_gdf.crs,
+                ))
+            
+            intersection_gdf = pd.concat(pieces, ignore_index=True)
         
-        if f'{code_field}_1' in intersection_gdf.columns:
-            intersection_gdf[code_field] = intersection_gdf[f'{code_field}_1']
-            intersection_gdf = intersection_gdf.drop(columns=[f'{code_field}_1', f'{code_field}_2'], errors='ignore')
+        if target_crs is None:
+            if not self._in_target_crs(intersection_gdf):
+                print(f"Reprojecting intersection from {intersection_gdf.crs} to {self.crs}")
+                intersection_gdf = intersection_gdf.to_crs(self.crs_obj)
+        elif intersection_gdf.crs is None or not intersection_gdf.crs.equals(
+                CRS.from_user_input(target_crs), ignore_axis_order=True):
+            print(f"Reprojecting intersection from {intersection_gdf.crs} to {target_crs}")
+            intersection_gdf = intersection_gdf.to_crs(target_crs)
         
         print(f"Created {len(intersection_gdf)} intersection polygons")
         return intersection_gdf
@@ -222,37 +468,38 @@ class CurveNumberCalculator:
         --------
         GeoDataFrame : Data with assigned curve numbers
         """
-        # Create lookup dictionary
-        lookup_dict = {}
-        for _, row in lookup_df.iterrows():
-            lu_value = row['LUValue']
-            for hg in ['A', 'B', 'C', 'D']:
-                if hg in row:
-                    lookup_dict[(lu_value, hg)] = row[hg]
-        
-        # Assign CN values
-        cn_values = []
-        for _, row in intersection_gdf.iterrows():
-            key = (row[code_field], row[hydgrp_field])
-            cn = lookup_dict.get(key, None)
-            cn_values.append(cn)
-        
-        intersection_gdf['CN'] = cn_values
+        # Long-format lookup: one CN per (land use code, soil group) pair.
+        # The built-in NLCD table is melted once at import.
+        if lookup_df.equals(_NLCD_LOOKUP_DF):
+            cn_lookup = _NLCD_LOOKUP_LONG
+        else:
+            cn_lookup = _long_cn_lookup(lookup_df)
+        
+        # Assign CN values in one vectorized reindex; pairs missing from the
+        # lookup come back as NaN
+        keys = pd.MultiIndex.from_arrays(
+            [intersection_gdf[code_field], intersection_gdf[hydgrp_field]]
+        )
+        intersection_gdf['CN'] = cn_lookup.reindex(keys).to_numpy()
         
         # Report statistics
         valid_cn = intersection_gdf['CN'].notna()
         print(f"Assigned curve numbers to {valid_cn.sum()}/{len(intersection_gdf)} polygons")
         
         if not valid_cn.all():
-            missing_combos = intersection_gdf[~valid_cn][[code_field, hydgrp_field]].drop_duplicates()
+            # One row per missing (land use, soil group) pair; this is a
+            # handful of combinations however many polygons lack a CN
+            missing_combos = intersection_gdf.loc[~valid_cn, [code_field, hydgrp_field]] \
+                .groupby([code_field, hydgrp_field], dropna=False, sort=False).size()
             print(f"Warning: {(~valid_cn).sum()} polygons have no CN value")
             print("   Missing land use/soil combinations:")
-            for _, row in missing_combos.iterrows():
-                print(f"     Land Use: {row[code_field]}, Soil Group: {row[hydgrp_field]}")
+            for (code, group), n_polygons in missing_combos.items():
+                print(f"     Land Use: {code}, Soil Group: {group} ({n_polygons} polygons)")
         
         return intersection_gdf
     
-    def dissolve_by_cn(self, cn_gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    def dissolve_by_cn(self, cn_gdf: gpd.GeoDataFrame,
+                       assume_coverage: bool = True) -> gpd.GeoDataFrame:
         """
         Dissolve polygons by curve number value.
         
@@ -260,25 +507,74 @@ class CurveNumberCalculator:
         -----------
         cn_gdf : GeoDataFrame
             Data with curve numbers assigned
+        assume_coverage : bool
+            Treat the polygons as a coverage: they may share edges but never
+            overlap, as the pieces from compute_intersection do when the soil
+            and land use layers are themselves non-overlapping. Each CN group
+            is then merged with GEOS's coverage union, which is much faster
+            than a general union. When the input overlaps after all, GEOS
+            either raises a topology error or returns an invalid geometry;
+            either way that group is merged again with the general union.
+            Pass False for layers that are known to overlap.
             
         Returns:
         --------
         GeoDataFrame : Dissolved polygons by CN value
         """
-        # Remove invalid CN values
-        valid_gdf = cn_gdf[cn_gdf['CN'].notna()].copy()
+        # Remove invalid CN values; only the CN and geometry arrays are
+        # needed, so the frame itself is not filtered or copied
+        valid = cn_gdf['CN'].notna().to_numpy()
         
-        if len(valid_gdf) == 0:
+        if not valid.any():
             raise ValueError("No valid curve numbers found!")
         
         print("Dissolving polygons by curve number...")
         
-        # Calculate area before dissolving
-        valid_gdf['area_ha'] = valid_gdf.geometry.area / 10000  # Convert to hectares
+        cn_values = cn_gdf['CN'].to_numpy()[valid]
+        geoms = cn_gdf.geometry.to_numpy()[valid]
         
-        # Dissolve and aggregate statistics
-        dissolved = valid_gdf.dissolve(by='CN', aggfunc={'area_ha': 'sum'})
-        dissolved = dissolved.reset_index()
+        # Calculate area before dissolving
+        areas = shapely.area(geoms) / 10000  # Convert to hectares
+        
+        # Dissolve: sort the polygons by CN once, then union each CN's
+        # contiguous slice in a single GEOS call
+        codes, cn_unique = pd.factorize(cn_values, sort=True)
+        
+        # Whole-number CN (always the case with the NLCD table) is stored as
+        # uint8 from here on: the raster burns it without conversion and
+        # the statistics read an eighth of the bytes. Fractional CN from a
+        # custom lookup table keeps its dtype.
+        if cn_unique.min() >= 0 and cn_unique.max() <= 255 \
+                and np.all(cn_unique == np.floor(cn_unique)):
+            cn_unique = cn_unique.astype(np.uint8)
+        order = np.argsort(codes, kind='stable')
+        edges = np.searchsorted(codes[order], np.arange(len(cn_unique) + 1))
+        sorted_geoms = geoms[order]
+        use_coverage = assume_coverage and hasattr(shapely, 'coverage_union_all')
+        
+        def union_group(group):
+            if use_coverage:
+                try:
+                    merged = shapely.coverage_union_all(group)
+                except GEOSException:
+                    # e.g. "side location conflict" on overlapping pieces
+                    merged = None
+                if merged is not None and shapely.is_valid(merged):
+                    return merged
+            return shapely.union_all(group)
+        
+        dissolved = gpd.GeoDataFrame(
+            {
+                'CN': cn_unique,
+                'geometry': [
+                    union_group(sorted_geoms[start:end])
+                    for start, end in zip(edges[:-1], edges[1:])
+                ],
+                'area_ha': np.bincount(codes, weights=areas, minlength=len(cn_unique)),
+            },
+            geometry='geometry',
+            crs=cn_gdf.crs,
+        )
         
         print(f"Dissolved to {len(dissolved)} unique curve number polygons")
         
@@ -123,7 +123,7 @@ def load_tile_index() -> gpd.GeoDataFrame:
             "The GCN10 tile index file is missing from the app installation "
             f"(expected at {TILE_INDEX_PATH})."
         )
-    return gpd.read_file(TILE_INDEX_PATH)
+    return gpd.read_file(TILE_INDEX_PATH, engine="pyogrio", use_arrow=True)
 
 
 def find_block_fids(aoi_4326: gpd.GeoDataFrame) -> list:
@@ -13,6 +13,50 @@ from typing import Tuple, Optional
 import tempfile
 import os
 
+# Smallest GDAL block cache used while burning CN polygons, in bytes.
+# rasterio hands GDAL_CACHEMAX to GDALSetCacheMax64, so a bare 512 would
+# shrink the cache to 512 bytes rather than raise it to 512 MB.
+_MIN_RASTERIZE_CACHE_BYTES = 512 * 1024 * 1024
+
+# Cloud-Optimized GeoTIFF layout for CN rasters: 512x512 DEFLATE tiles plus
+# internal overviews, so map previews only read the tiles they need.
+# Overviews use nearest neighbour because CN values are categories.
+_CN_RASTER_PROFILE = {
+    'driver': 'COG',
+    'compress': 'DEFLATE',
+    'blocksize': 512,
+    'overview_resampling': 'NEAREST',
+    'bigtiff': 'IF_SAFER',
+}
+
+
+def _build_cn_colormap():
+    """Build the CN raster colormap (0-100) as {value: (r, g, b, a)}."""
+    cn = np.arange(101)
+    rgba = np.select(
+        [
+            cn[:, None] == 0,   # NoData - transparent
+            cn[:, None] < 30,   # Very low CN - blue
+            cn[:, None] < 50,   # Low CN - light blue
+            cn[:, None] < 70,   # Medium CN - yellow
+            cn[:, None] < 85,   # High CN - orange
+        ],
+        [
+            (0, 0, 0, 0),
+            (0, 0, 255, 255),
+            (100, 150, 255, 255),
+            (255, 255, 0, 255),
+            (255, 165, 0, 255),
+        ],
+        default=(255, 0, 0, 255),  # Very high CN - red
+    )
+    return {int(value): tuple(int(c) for c in color) for value, color in zip(cn, rgba)}
+
+
+# Built once at import; every CN raster is written with the same colormap
+_CN_COLORMAP = _build_cn_colormap()
+
+
 class SpatialOperations:
     """Handle spatial operations including rasterization and CRS transformations."""
 
@@ -123,27 +167,32 @@ class SpatialOperations:
         # Create transform
         transform = from_bounds(minx, miny, maxx, maxy, width, height)
         
-        # Prepare shapes for rasterization
-        shapes = [(geom, value) for geom, value in 
-                  zip(cn_gdf.geometry, cn_gdf['CN'])]
+        # Prepare shapes for rasterization. Dissolved CN is normally uint8
+        # already; fractional CN from a custom lookup table is rounded here
+        # rather than letting the uint8 burn silently truncate (77.9 -> 77).
+        cn_values = cn_gdf['CN'].to_numpy()
+        if cn_values.dtype != np.uint8:
+            cn_values = np.rint(cn_values.astype(float)).astype(np.uint8)
+        geoms = cn_gdf.geometry
+        burnable = (geoms.notna() & ~geoms.is_empty).to_numpy()
         
-        # Rasterize
-        raster = features.rasterize(
-            shapes=shapes,
-            out_shape=(height, width),
-            transform=transform,
-            fill=0,  # NoData value
-            dtype=rasterio.uint8
-        )
+        # Rasterize into a preallocated NoData grid. The shapes are fed
+        # lazily; with nothing to burn the grid stays all NoData (rasterize
+        # itself refuses an empty shape list).
+        raster = np.zeros((height, width), dtype=np.uint8)
+        if burnable.any():
+            shapes = zip(geoms.values[burnable], cn_values[burnable])
+            SpatialOperations._burn_cn_polygons(shapes, raster, transform)
         
-        # Create output path if not provided
+        # Reserve a unique output path if none was provided. mkstemp creates
+        # the file atomically, so concurrent runs can never pick the same name.
         if output_path is None:
-            output_path = os.path.join(tempfile.gettempdir(), 'cn_raster.tif')
+            fd, output_path = tempfile.mkstemp(prefix='cn_raster_', suffix='.tif')
+            os.close(fd)
         
         # Write raster
         with rasterio.open(
             output_path, 'w',
-            driver='GTiff',
             height=height,
             width=width,
             count=1,
@@ -151,7 +200,7 @@ class SpatialOperations:
             crs=cn_gdf.crs,
             transform=transform,
             nodata=0,
-            compress='lzw'
+            **_CN_RASTER_PROFILE
         ) as dst:
             dst.write(raster, 1)
             dst.write_colormap(1, SpatialOperations._create_cn_colormap())
@@ -160,6 +209,29 @@ class SpatialOperations:
 
         return output_path
 
+    @staticmethod
+    def _burn_cn_polygons(shapes, out, transform):
+        """
+        Burn (geometry, CN) pairs into the uint8 grid out, in place.
+
+        GDAL's polygon rasterizer already fills each polygon row by row with
+        a scan-line algorithm in compiled code. The dissolved CN polygons do
+        not overlap, so every cell is written at most once and the burn
+        order does not matter.
+
+        rasterize falls back to a much slower path when the output grid is
+        larger than GDAL's block cache (5% of RAM by default), so the cache
+        is raised to at least twice the grid size for the duration of the
+        call.
+        """
+        cache_bytes = max(_MIN_RASTERIZE_CACHE_BYTES, 2 * out.nbytes)
+        with rasterio.Env(GDAL_CACHEMAX=cache_bytes):
+            return features.rasterize(
+                shapes=shapes,
+                out=out,
+                transform=transform
+            )
+
     @staticmethod
     def clip_raster_to_boundary(raster_path: str,
                                 boundary_gdf: gpd.GeoDataFrame,
@@ -187,7 +259,6 @@ class SpatialOperations:
         """
         with rasterio.open(raster_path) as src:
             data = src.read(1)
-            profile = src.profile
             transform = src.transform
             raster_crs = src.crs
             try:
@@ -208,7 +279,18 @@ class SpatialOperations:
         )
         data[outside] = nodata
 
-        profile.update(nodata=nodata)
+        # Rewrite with the full COG profile; copying the source profile
+        # would keep the tiles but drop the overviews and COG ordering.
+        profile = dict(
+            _CN_RASTER_PROFILE,
+            height=data.shape[0],
+            width=data.shape[1],
+            count=1,
+            dtype=data.dtype,
+            crs=raster_crs,
+            transform=transform,
+            nodata=nodata,
+        )
         with rasterio.open(raster_path, 'w', **profile) as dst:
             dst.write(data, 1)
             if colormap is not None:
@@ -219,28 +301,8 @@ class SpatialOperations:
 
     @staticmethod
     def _create_cn_colormap():
-        """Create a colormap for CN values (30-100)."""
-        colormap = {}
-        for cn in range(0, 101):
-            if cn == 0:
-                # NoData - transparent
-                colormap[cn] = (0, 0, 0, 0)
-            elif cn < 30:
-                # Very low CN - blue
-                colormap[cn] = (0, 0, 255, 255)
-            elif cn < 50:
-                # Low CN - light blue
-                colormap[cn] = (100, 150, 255, 255)
-            elif cn < 70:
-                # Medium CN - yellow
-                colormap[cn] = (255, 255, 0, 255)
-            elif cn < 85:
-                # High CN - orange
-                colormap[cn] = (255, 165, 0, 255)
-            else:
-                # Very high CN - red
-                colormap[cn] = (255, 0, 0, 255)
-        return colormap
+        """Colormap for CN values (30-100); built once, see _CN_COLORMAP."""
+        return _CN_COLORMAP
     
     @staticmethod
     def validate_crs_compatibility(gdf1: gpd.GeoDataFrame, 
@@ -261,6 +323,10 @@ class SpatialOperations:
             print("Warning: One or both datasets lack CRS information")
             return False
         
+        # Layers that share one CRS object need no comparison at all
+        if gdf1.crs is gdf2.crs:
+            return True
+        
         if gdf1.crs != gdf2.crs:
             print(f"CRS mismatch detected:")
             print(f"   Dataset 1: {gdf1.crs}")
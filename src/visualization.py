@@ -6,38 +6,51 @@ Create plots and visual outputs for CN analysis
 import matplotlib.pyplot as plt
 import seaborn as sns
 import geopandas as gpd
+import shapely
 import pandas as pd
 import numpy as np
 from typing import Optional
 import io
-import base64
 import folium
 import tempfile
 import os
 import branca.colormap as cm
-import json
+from branca.element import MacroElement
+from jinja2 import Template
+from html import escape as escape_html
+from functools import lru_cache
 import rasterio
 from rasterio.vrt import WarpedVRT
 from rasterio.enums import Resampling
+from rasterio.warp import transform_bounds
+
+# Click handler for report download buttons: wraps the CSV text kept in the
+# hidden textarea next to the link in a Blob and points the link at it just
+# before the browser follows it
+_CSV_BLOB_ONCLICK = (
+    "var url = URL.createObjectURL(new Blob([this.previousElementSibling.value], "
+    "{type: 'text/csv'})); this.href = url; "
+    "setTimeout(function() { URL.revokeObjectURL(url); }, 10000);"
+)
+
+def create_csv_download_button(df, filename, label):
+    """
+    Create an HTML download button for a DataFrame as CSV.
 
-def get_file_as_base64(file_path):
-    """Convert file to base64 for inline download."""
+    The CSV travels in the page as escaped text and is turned into a Blob
+    only when clicked, instead of as a base64 data URI, which is a third
+    larger and has to be encoded up front. Returns an empty string if the
+    CSV cannot be written.
+    """
     try:
-        with open(file_path, 'rb') as f:
-            return base64.b64encode(f.read()).decode()
-    except:
+        csv_text = df.to_csv(index=False)
+    except (TypeError, ValueError):
         return ""
-
-def create_csv_download_link(df, filename="watershed_statistics.csv"):
-    """Create a CSV download link from DataFrame."""
-    try:
-        # Create CSV string
-        csv_string = df.to_csv(index=False)
-        # Convert to base64
-        csv_b64 = base64.b64encode(csv_string.encode()).decode()
-        return csv_b64, filename
-    except:
-        return None, None
+    return (
+        f'<span><textarea hidden>{escape_html(csv_text)}</textarea>'
+        f'<a href="#" download="{escape_html(filename)}" class="download-button" '
+        f'onclick="{escape_html(_CSV_BLOB_ONCLICK)}">{label}</a></span>'
+    )
 
 def read_cn_display_image(raster_path, max_dimension=2048, nodata=0):
     """
@@ -79,6 +92,50 @@ def read_cn_display_image(raster_path, max_dimension=2048, nodata=0):
     return data, (bounds.bottom, bounds.left, bounds.top, bounds.right)
 
 
+class WatershedLabels(MacroElement):
+    """
+    All watershed labels of one map layer as a single GeoJSON point layer.
+
+    The labels ship as one FeatureCollection of centroid points with the
+    label text as a property. A pointToLayer callback turns each point into
+    a DivIcon marker in the browser, so the parent layer gets one Leaflet
+    layer instead of one folium.Marker object and script block per label.
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function() {
+            var style = {{ this.label_style|tojson }};
+            L.geoJSON({{ this.data }}, {
+                pointToLayer: function(feature, latlng) {
+                    return L.marker(latlng, {
+                        icon: L.divIcon({
+                            html: '<div class="watershed-label" style="' + style + '">'
+                                + feature.properties.label + '</div>',
+                            className: 'watershed-label-marker',
+                            iconSize: [0, 0],
+                            iconAnchor: [0, 0]
+                        })
+                    });
+                }
+            }).addTo({{ this._parent.get_name() }});
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, points_gdf, transform="none"):
+        super().__init__()
+        self._name = 'WatershedLabels'
+        # Label text is HTML-escaped by the caller, so the JSON can be
+        # embedded in the script as is
+        self.data = points_gdf.to_json(drop_id=True)
+        self.label_style = (
+            "font-size: 16px; font-weight: bold; color: white; "
+            "text-shadow: 2px 2px 4px black; white-space: nowrap; "
+            f"transform: {transform};"
+        )
+
+
 def add_watershed_cn_labels(layer, watershed_gdf, watershed_field, stats_df,
                             prefix, position="center"):
     """
@@ -98,38 +155,88 @@ def add_watershed_cn_labels(layer, watershed_gdf, watershed_field, stats_df,
     }
     transform = offsets.get(position, "none")
 
-    for idx, row in watershed_gdf.iterrows():
-        try:
-            watershed_name = row[watershed_field]
-            centroid = row.geometry.centroid
-
-            mean_cn = "N/A"
-            if watershed_name in stats_df[watershed_field].values:
-                stats_row = stats_df[stats_df[watershed_field] == watershed_name]
-                if not stats_row.empty and 'mean' in stats_row.columns:
-                    mean_cn = f"{stats_row['mean'].iloc[0]:.1f}"
-
-            label_text = f"{prefix}={mean_cn}"
-
-            folium.Marker(
-                location=[centroid.y, centroid.x],
-                icon=folium.DivIcon(
-                    html=f'''<div class="watershed-label" style="
-                        font-size: 16px;
-                        font-weight: bold;
-                        color: white;
-                        text-shadow: 2px 2px 4px black;
-                        white-space: nowrap;
-                        transform: {transform};
-                    ">{label_text}</div>''',
-                    class_name='watershed-label-marker',
-                    icon_size=(0, 0),
-                    icon_anchor=(0, 0)
-                )
-            ).add_to(layer)
-        except Exception as e:
-            print(f"Warning: Could not add label for watershed {row.get(watershed_field, 'unknown')}: {e}")
-            continue
+    # Mean CN per watershed, built once so each label is a dict lookup
+    # rather than two scans of the statistics table. The first row wins
+    # for a repeated name, as before.
+    mean_map = {}
+    if 'mean' in stats_df.columns:
+        for name, mean_val in zip(stats_df[watershed_field].tolist(), stats_df['mean'].tolist()):
+            mean_map.setdefault(name, mean_val)
+
+    # All centroids in one vectorized GEOS pass; missing or empty
+    # geometries come back with NaN coordinates and get no label
+    centroids = shapely.centroid(watershed_gdf.geometry.to_numpy())
+    xs = shapely.get_x(centroids)
+    ys = shapely.get_y(centroids)
+    names = watershed_gdf[watershed_field].to_numpy()
+
+    located = np.isfinite(xs) & np.isfinite(ys)
+    for watershed_name in names[~located]:
+        print(f"Warning: Could not add label for watershed {watershed_name}: no geometry")
+    if not located.any():
+        return
+
+    label_texts = []
+    for watershed_name in names[located]:
+        mean_val = mean_map.get(watershed_name)
+        mean_cn = f"{mean_val:.1f}" if mean_val is not None and pd.notna(mean_val) else "N/A"
+        label_texts.append(escape_html(f"{prefix}={mean_cn}"))
+
+    points_gdf = gpd.GeoDataFrame(
+        {'label': label_texts},
+        geometry=gpd.points_from_xy(xs[located], ys[located]),
+        crs='EPSG:4326'
+    )
+    WatershedLabels(points_gdf, transform).add_to(layer)
+
+
+# Value types shown as stat boxes in the summary report
+_NUM_TYPES = (int, float, np.floating, np.integer)
+
+# Color ramp shared by the CN and GCN10 overlays and the map legend
+CN_COLORS = ['#0000FF', '#4169E1', '#00CED1', '#FFD700', '#FFA500', '#FF4500', '#DC143C', '#8B0000']
+
+
+def _cn_colormap(vmin, vmax):
+    """Build the CN legend colormap for a value range."""
+    return cm.LinearColormap(
+        colors=CN_COLORS,
+        vmin=vmin,
+        vmax=vmax,
+        caption='Curve Number Values'
+    )
+
+
+@lru_cache(maxsize=32)
+def _cn_color_table(vmin, vmax):
+    """
+    RGBA lookup table (256 entries, CN 0-100 filled) for a value range.
+
+    Built once per range and returned read-only; callers copy it before
+    setting their NoData entry. The colors are interpolated between the
+    colormap stops in one numpy pass, with the same byte rounding as
+    branca's rgba_bytes_tuple.
+    """
+    colormap = _cn_colormap(vmin, vmax)
+    cn_range = np.clip(np.arange(101, dtype=float), vmin, vmax)
+    stops = np.asarray(colormap.index, dtype=float)
+    stop_colors = np.asarray(colormap.colors, dtype=float)
+    lut = np.zeros((256, 4), dtype=np.uint8)
+    for band in range(3):
+        lut[:101, band] = (
+            np.interp(cn_range, stops, stop_colors[:, band]) * 255.9999
+        ).astype(np.uint8)
+    lut[:101, 3] = 255
+    lut.flags.writeable = False
+    return lut
+
+
+# numpy dtype kinds that serialize to JSON as they are: bool, integers,
+# floats and strings (datetimes are dropped or cast before this is consulted)
+SAFE_KINDS = set('biufUS')
+
+# Python types an object column may hold and still serialize as is
+_JSON_SCALAR_TYPES = (str, int, float, bool, type(None))
 
 
 def clean_gdf_for_folium(gdf, keep_columns=None):
@@ -145,20 +252,60 @@ def clean_gdf_for_folium(gdf, keep_columns=None):
     
     # Only keep columns that exist in the GeoDataFrame
     keep_columns = [col for col in keep_columns if col in gdf.columns]
-    clean_gdf = gdf[keep_columns].copy()
+    # The geometries are never modified, so no explicit deep copy is taken;
+    # a column that needs casting is swapped in with assign below
+    clean_gdf = gdf[keep_columns]
     
-    # Convert any remaining problematic columns to strings
+    # Convert any remaining problematic columns to strings, deciding from
+    # the dtype; object columns are judged by the type of their first value
     for col in clean_gdf.columns:
-        if col != 'geometry':
-            try:
-                # Test if column can be JSON serialized
-                if len(clean_gdf) > 0:
-                    json.dumps(clean_gdf[col].iloc[0], default=str)
-            except (TypeError, ValueError):
-                clean_gdf[col] = clean_gdf[col].astype(str)
+        if col == 'geometry' or len(clean_gdf) == 0:
+            continue
+        kind = clean_gdf[col].dtype.kind
+        if kind in SAFE_KINDS:
+            continue
+        if kind == 'O' and isinstance(clean_gdf[col].iat[0], _JSON_SCALAR_TYPES):
+            continue
+        clean_gdf = clean_gdf.assign(**{col: clean_gdf[col].astype(str)})
     
     return clean_gdf
 
+# Deepest zoom at which simplified map outlines must still look exact. The
+# tolerance is half a screen pixel there, so the initial zoom-10 view and a
+# few levels of zooming in show no difference.
+DISPLAY_SIMPLIFY_ZOOM = 14
+
+
+def simplify_for_display(gdf, zoom=DISPLAY_SIMPLIFY_ZOOM):
+    """
+    Drop polygon vertices that fall below one screen pixel at the given zoom.
+
+    The layer is simplified in its local UTM zone, where the tolerance is in
+    meters, and returned in EPSG:4326. Fewer vertices mean a smaller GeoJSON
+    embedded in the map page and faster drawing in the browser.
+    """
+    if gdf is None or len(gdf) == 0 or gdf.crs is None:
+        return gdf
+    geographic = gdf.to_crs('EPSG:4326') if gdf.crs.to_epsg() != 4326 else gdf
+    west, south, east, north = geographic.total_bounds
+    if not np.all(np.isfinite([west, south, east, north])):
+        return geographic
+    # Web Mercator ground resolution (m/pixel) at the layer's mid-latitude
+    meters_per_pixel = 156543.03 * np.cos(np.radians((south + north) / 2)) / 2 ** zoom
+    utm = geographic.to_crs(geographic.estimate_utm_crs())
+    utm = utm.set_geometry(utm.geometry.simplify(meters_per_pixel / 2, preserve_topology=True))
+    return utm.to_crs('EPSG:4326')
+
+
+# Outline style shared by every watershed polygon on the map
+WATERSHED_STYLE = {
+    'color': '#000000',
+    'weight': 2,
+    'fillOpacity': 0,
+    'opacity': 1,
+    'dashArray': '5, 5'
+}
+
 class CNVisualization:
     """Create visualizations for Curve Number analysis."""
     
@@ -199,10 +346,10 @@ class CNVisualization:
         --------
         str : HTML content for the map
         """
-        # Folium works in geographic coordinates, so reproject display copies
-        if cn_gdf is not None and cn_gdf.crs is not None and not cn_gdf.crs.to_string().startswith('EPSG:4326'):
-            cn_gdf = cn_gdf.to_crs('EPSG:4326')
-        if watershed_gdf is not None and watershed_gdf.crs is not None and not watershed_gdf.crs.to_string().startswith('EPSG:4326'):
+        # Folium works in geographic coordinates, so reproject display copies.
+        # The CN polygons are never drawn (the CN layer is the raster image
+        # overlay), so only their extent is reprojected, and only if needed.
+        if watershed_gdf is not None and watershed_gdf.crs is not None and watershed_gdf.crs.to_epsg() != 4326:
             watershed_gdf = watershed_gdf.to_crs('EPSG:4326')
 
         # Read the user CN raster as a display image (reprojected to EPSG:4326)
@@ -227,6 +374,8 @@ class CNVisualization:
             bounds = (west, south, east, north)
         elif cn_gdf is not None:
             bounds = cn_gdf.total_bounds
+            if cn_gdf.crs is not None and cn_gdf.crs.to_epsg() != 4326:
+                bounds = transform_bounds(cn_gdf.crs, 'EPSG:4326', *bounds)
         elif watershed_gdf is not None:
             bounds = watershed_gdf.total_bounds
         elif gcn10_bounds is not None:
@@ -237,11 +386,13 @@ class CNVisualization:
         center_lat = (bounds[1] + bounds[3]) / 2
         center_lon = (bounds[0] + bounds[2]) / 2
         
-        # Create folium map with no default tiles (we'll add basemaps manually)
+        # Create folium map with no default tiles (we'll add basemaps manually).
+        # Vector layers draw on one canvas rather than one SVG node each.
         m = folium.Map(
             location=[center_lat, center_lon],
             zoom_start=10,
-            tiles=None
+            tiles=None,
+            prefer_canvas=True
         )
         
         # Add basemap options
@@ -283,24 +434,23 @@ class CNVisualization:
         if max_cn <= min_cn:
             max_cn = min_cn + 1
 
-        colormap = cm.LinearColormap(
-            colors=['#0000FF', '#4169E1', '#00CED1', '#FFD700', '#FFA500', '#FF4500', '#DC143C', '#8B0000'],
-            vmin=min_cn,
-            vmax=max_cn,
-            caption='Curve Number Values'
-        )
+        # Legend element for this map; it is attached to the map, so unlike
+        # the color table below it is not shared between calls
+        colormap = _cn_colormap(min_cn, max_cn)
 
         # When both rasters are shown, offset their labels so they can be
         # read at the same time (CN above the centroid, GCN10 below it)
         both_label_sets = watershed_stats is not None and gcn10_watershed_stats is not None
 
+        # Look up every CN color once; both overlays index this table
+        # instead of asking the colormap again for each value
+        color_lut = _cn_color_table(min_cn, max_cn)
+
         # Add the user CN raster as a toggleable image overlay
         if cn_image is not None:
             # Build an RGBA image from the shared colormap, NoData (0) transparent
-            lut = np.zeros((256, 4), dtype=np.uint8)
-            for cn in range(1, 101):
-                rgba = colormap.rgba_bytes_tuple(min(max(cn, min_cn), max_cn))
-                lut[cn] = (rgba[0], rgba[1], rgba[2], 255)
+            lut = color_lut.copy()
+            lut[0] = (0, 0, 0, 0)
             rgba_image = lut[cn_image]
 
             south, west, north, east = cn_bounds
@@ -324,10 +474,7 @@ class CNVisualization:
         # Add the GCN10 raster as a toggleable image overlay
         if gcn10_image is not None:
             # Build an RGBA image from the shared colormap, NoData transparent
-            lut = np.zeros((256, 4), dtype=np.uint8)
-            for cn in range(0, 101):
-                rgba = colormap.rgba_bytes_tuple(min(max(cn, min_cn), max_cn))
-                lut[cn] = (rgba[0], rgba[1], rgba[2], 255)
+            lut = color_lut.copy()
             lut[GCN10_NODATA] = (0, 0, 0, 0)
             rgba_image = lut[gcn10_image]
 
@@ -359,21 +506,21 @@ class CNVisualization:
             # Create FeatureGroup for watersheds with layer control
             watershed_layer = folium.FeatureGroup(name='Watersheds', control=True, show=True)
             
+            # Every watershed shares one style, so the per-feature callback
+            # just hands back the same prebuilt dict
             def watershed_style(feature):
-                return {
-                    'color': '#000000',
-                    'weight': 2,
-                    'fillOpacity': 0,
-                    'opacity': 1,
-                    'dashArray': '5, 5'
-                }
+                return WATERSHED_STYLE
             
-            # Clean watershed GeoDataFrame
-            watershed_clean = clean_gdf_for_folium(watershed_gdf, ['geometry', watershed_field])
+            # Clean watershed GeoDataFrame; only the drawn outlines are
+            # simplified, the labels still use the full geometry
+            watershed_clean = clean_gdf_for_folium(
+                simplify_for_display(watershed_gdf[[watershed_field, watershed_gdf.geometry.name]]),
+                ['geometry', watershed_field]
+            )
             
-            # Add watershed polygons
+            # Add watershed polygons, serialized by geopandas in one call
             folium.GeoJson(
-                watershed_clean,
+                watershed_clean.to_json(),
                 style_function=watershed_style,
                 tooltip=folium.GeoJsonTooltip(
                     fields=[watershed_field],
@@ -516,7 +663,9 @@ class CNVisualization:
         --------
         str : HTML report content
         """
-        html = """
+        # The report is collected as a list of fragments and joined once at
+        # the end instead of growing one string with +=
+        parts = ["""
         <html>
         <head>
             <style>
@@ -615,13 +764,13 @@ class CNVisualization:
         </head>
         <body>
             <h1>SCS Curve Number Analysis Report</h1>
-        """
+        """]
         
         # Global Statistics Section - excluding percentile_10 and percentile_75
         if stats is not None:
             user_stats_heading = "Global Statistics" if gcn10_info is None else "Your Generated CN: Summary Statistics"
-            html += f"<h2>{user_stats_heading}</h2>"
-            html += '<div class="stats-container">'
+            parts.append(f"<h2>{user_stats_heading}</h2>")
+            parts.append('<div class="stats-container">')
 
             # Define which statistics to exclude
             excluded_stats = {'percentile_10', 'percentile_75', 'count', 'unique_values', 'missing_hydrogroup_count'}
@@ -637,29 +786,35 @@ class CNVisualization:
                 'percentile_90': '90th Percentile',
             }
 
-            for key, value in stats.items():
-                if key not in excluded_stats and isinstance(value, (int, float)):
-                    display_key = labels.get(key, key.replace("_", " ").title())
-                    html += f'<div class="stat-box"><strong>{display_key}</strong><br>{value:.2f}</div>'
+            # numpy scalars count as numbers too (np.float64 is a float, but
+            # np.int64 or np.float32 are not)
+            numeric_items = {
+                key: value for key, value in stats.items()
+                if key not in excluded_stats and isinstance(value, _NUM_TYPES)
+            }
+            parts.extend(
+                f'<div class="stat-box"><strong>{labels.get(key, key.replace("_", " ").title())}</strong><br>{value:.2f}</div>'
+                for key, value in numeric_items.items()
+            )
 
             # Add missing hydrogroup count in red if > 0
             if 'missing_hydrogroup_count' in stats and stats['missing_hydrogroup_count'] > 0:
-                html += f'<div class="stat-box warning"><strong>Missing Hydrogroups</strong><br>{stats["missing_hydrogroup_count"]}</div>'
+                parts.append(f'<div class="stat-box warning"><strong>Missing Hydrogroups</strong><br>{stats["missing_hydrogroup_count"]}</div>')
 
-            html += "</div>"
+            parts.append("</div>")
 
             # Add footnote for weighted mean
-            html += '<div class="footnote">* Weighted Mean is calculated using polygon areas as weights, providing a more representative average for the study area.</div>'
+            parts.append('<div class="footnote">* Weighted Mean is calculated using polygon areas as weights, providing a more representative average for the study area.</div>')
 
             # Add warning footnote if there are missing hydrogroups
             if 'missing_hydrogroup_count' in stats and stats['missing_hydrogroup_count'] > 0:
-                html += f'<div class="footnote" style="font-weight: bold;">** {stats["missing_hydrogroup_count"]} soil polygons have missing or invalid hydrologic group values and were excluded from analysis.</div>'
+                parts.append(f'<div class="footnote" style="font-weight: bold;">** {stats["missing_hydrogroup_count"]} soil polygons have missing or invalid hydrologic group values and were excluded from analysis.</div>')
 
         # GCN10 summary statistics
         if gcn10_info is not None:
             gcn10_label = gcn10_info.get('label', 'GCN10')
-            html += f"<h2>{gcn10_label}: Summary Statistics</h2>"
-            html += '<div class="stats-container">'
+            parts.append(f"<h2>{gcn10_label}: Summary Statistics</h2>")
+            parts.append('<div class="stats-container">')
             gcn10_labels = [
                 ('min', 'Minimum CN'),
                 ('max', 'Maximum CN'),
@@ -670,12 +825,12 @@ class CNVisualization:
             gcn10_stats = gcn10_info.get('stats', {})
             for key, display_key in gcn10_labels:
                 if key in gcn10_stats:
-                    html += f'<div class="stat-box"><strong>{display_key}</strong><br>{gcn10_stats[key]:.2f}</div>'
-            html += "</div>"
-            html += ('<div class="footnote">GCN10 values are read from the global 10 m dataset on its '
-                     'native EPSG:4326 grid and clipped exactly to your boundary: a cell is kept only '
-                     'when its center falls inside the boundary. The statistics are computed from '
-                     'exactly the cells in the clipped raster.</div>')
+                    parts.append(f'<div class="stat-box"><strong>{display_key}</strong><br>{gcn10_stats[key]:.2f}</div>')
+            parts.append("</div>")
+            parts.append('<div class="footnote">GCN10 values are read from the global 10 m dataset on its '
+                         'native EPSG:4326 grid and clipped exactly to your boundary: a cell is kept only '
+                         'when its center falls inside the boundary. The statistics are computed from '
+                         'exactly the cells in the clipped raster.</div>')
         
         # Watershed Statistics (if provided)
         if watershed_stats is not None and not watershed_stats.empty:
@@ -694,23 +849,17 @@ class CNVisualization:
                 'range': 'CN Range',
             })
 
-            # Create CSV download
-            csv_b64, csv_filename = create_csv_download_link(report_stats, "watershed_statistics.csv")
-            
             # Header with download button
             ws_heading = "Watershed Statistics (First 5 Rows)" if gcn10_info is None else "Watershed Statistics, Your CN (First 5 Rows)"
-            html += '<div class="section-header">'
-            html += f'<h2 style="margin: 0; border: none; padding: 0;">{ws_heading}</h2>'
+            parts.append('<div class="section-header">')
+            parts.append(f'<h2 style="margin: 0; border: none; padding: 0;">{ws_heading}</h2>')
             
-            if csv_b64:
-                html += f'''
-                <a href="data:text/csv;base64,{csv_b64}" 
-                   download="{csv_filename}" class="download-button">
-                   Download Complete CSV ({len(report_stats)} rows)
-                </a>
-                '''
+            parts.append(create_csv_download_button(
+                report_stats, "watershed_statistics.csv",
+                f"Download Complete CSV ({len(report_stats)} rows)"
+            ))
             
-            html += '</div>'
+            parts.append('</div>')
             
             # Show only first 5 rows
             display_stats = report_stats.head(5).copy()
@@ -722,12 +871,12 @@ class CNVisualization:
                 table_id='watershed-stats',
                 float_format=lambda x: '{:.2f}'.format(x) if pd.notna(x) else 'N/A'
             )
-            html += watershed_html
+            parts.append(watershed_html)
             
-            html += '<p><em>The table above shows the first 5 rows. Use the download button to get all watershed statistics.</em></p>'
-            html += ('<div class="footnote">Watershed statistics come from exactly the raster cells '
-                     'clipped to each watershed: a cell counts when its center falls inside the '
-                     'watershed boundary, matching a standard GIS raster clip.</div>')
+            parts.append('<p><em>The table above shows the first 5 rows. Use the download button to get all watershed statistics.</em></p>')
+            parts.append('<div class="footnote">Watershed statistics come from exactly the raster cells '
+                         'clipped to each watershed: a cell counts when its center falls inside the '
+                         'watershed boundary, matching a standard GIS raster clip.</div>')
 
         # GCN10 watershed statistics
         if gcn10_watershed_stats is not None and not gcn10_watershed_stats.empty:
@@ -747,25 +896,20 @@ class CNVisualization:
                 'range': 'CN Range',
             })
 
-            csv_b64, csv_filename = create_csv_download_link(gcn10_report_stats, "gcn10_watershed_statistics.csv")
-
-            html += '<div class="section-header">'
-            html += f'<h2 style="margin: 0; border: none; padding: 0;">Watershed Statistics, {gcn10_label} (First 5 Rows)</h2>'
-            if csv_b64:
-                html += f'''
-                <a href="data:text/csv;base64,{csv_b64}"
-                   download="{csv_filename}" class="download-button">
-                   Download Complete CSV ({len(gcn10_report_stats)} rows)
-                </a>
-                '''
-            html += '</div>'
+            parts.append('<div class="section-header">')
+            parts.append(f'<h2 style="margin: 0; border: none; padding: 0;">Watershed Statistics, {gcn10_label} (First 5 Rows)</h2>')
+            parts.append(create_csv_download_button(
+                gcn10_report_stats, "gcn10_watershed_statistics.csv",
+                f"Download Complete CSV ({len(gcn10_report_stats)} rows)"
+            ))
+            parts.append('</div>')
 
-            html += gcn10_report_stats.head(5).to_html(
+            parts.append(gcn10_report_stats.head(5).to_html(
                 index=False,
                 classes='watershed-table',
                 float_format=lambda x: '{:.2f}'.format(x) if pd.notna(x) else 'N/A'
-            )
-            html += '<p><em>The table above shows the first 5 rows. Use the download button to get the full table.</em></p>'
+            ))
+            parts.append('<p><em>The table above shows the first 5 rows. Use the download button to get the full table.</em></p>')
 
         # Side-by-side comparison of the two CN sources
         if comparison_stats is not None and not comparison_stats.empty:
@@ -781,40 +925,35 @@ class CNVisualization:
                 'gcn10_max': 'Max (GCN10)',
             })
 
-            csv_b64, csv_filename = create_csv_download_link(comparison_display, "cn_comparison.csv")
+            parts.append('<div class="section-header">')
+            parts.append('<h2 style="margin: 0; border: none; padding: 0;">Comparison: Your CN vs GCN10 (First 5 Rows)</h2>')
+            parts.append(create_csv_download_button(
+                comparison_display, "cn_comparison.csv",
+                f"Download Complete CSV ({len(comparison_display)} rows)"
+            ))
+            parts.append('</div>')
 
-            html += '<div class="section-header">'
-            html += '<h2 style="margin: 0; border: none; padding: 0;">Comparison: Your CN vs GCN10 (First 5 Rows)</h2>'
-            if csv_b64:
-                html += f'''
-                <a href="data:text/csv;base64,{csv_b64}"
-                   download="{csv_filename}" class="download-button">
-                   Download Complete CSV ({len(comparison_display)} rows)
-                </a>
-                '''
-            html += '</div>'
-
-            html += comparison_display.head(5).to_html(
+            parts.append(comparison_display.head(5).to_html(
                 index=False,
                 classes='watershed-table',
                 float_format=lambda x: '{:.2f}'.format(x) if pd.notna(x) else 'N/A'
-            )
-            html += ('<div class="footnote">Each product is summarized on its own grid over the same watershed '
-                     'polygons, so differences reflect the underlying data sources rather than resampling. '
-                     'Mean Difference is your mean CN minus the GCN10 mean CN.</div>')
+            ))
+            parts.append('<div class="footnote">Each product is summarized on its own grid over the same watershed '
+                         'polygons, so differences reflect the underlying data sources rather than resampling. '
+                         'Mean Difference is your mean CN minus the GCN10 mean CN.</div>')
 
         # GCN10 credit and citation (required by the dataset license)
         if gcn10_info is not None:
             from src.gcn10 import (GCN10_ATTRIBUTION, GCN10_CITATION,
                                    GCN10_LICENSE_NOTE, GCN10_DATASET_URL)
-            html += '<h2>GCN10 Data Credit</h2>'
-            html += (f'<p>GCN10 data source: <a href="{GCN10_DATASET_URL}" target="_blank">'
-                     f'{GCN10_ATTRIBUTION}</a>. {GCN10_LICENSE_NOTE}</p>')
-            html += f'<p class="footnote">Citation: {GCN10_CITATION}</p>'
+            parts.append('<h2>GCN10 Data Credit</h2>')
+            parts.append(f'<p>GCN10 data source: <a href="{GCN10_DATASET_URL}" target="_blank">'
+                         f'{GCN10_ATTRIBUTION}</a>. {GCN10_LICENSE_NOTE}</p>')
+            parts.append(f'<p class="footnote">Citation: {GCN10_CITATION}</p>')
 
-        html += """
+        parts.append("""
         </body>
         </html>
-        """
+        """)
 
-        return html
+        return ''.join(parts)
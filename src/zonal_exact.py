@@ -13,8 +13,15 @@ all. In that case the zone's statistics are reported as empty (NaN with a
 count of zero) rather than guessed from nearby cells.
 
 Only rasterio and numpy are used, so no extra dependency is needed.
+Zones are summarized in parallel threads, each with its own open dataset;
+GDAL releases the GIL while reading, so windows are read concurrently.
 """
 
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import rasterio
 from rasterio.features import geometry_mask
@@ -22,6 +29,23 @@ from rasterio.windows import from_bounds, Window
 
 _STAT_KEYS = ["min", "max", "mean", "median", "std", "count"]
 
+# Upper bound on reader threads; each holds one open raster handle.
+MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+# Zones are split into this many chunks per thread to balance the load.
+CHUNKS_PER_WORKER = 4
+
+# Total size of the zone masks kept between runs (bit-packed, 1 bit per
+# cell). A 10k x 10k window packs to about 12.5 MB, so this holds a few
+# large watersheds or many small ones.
+MASK_CACHE_BYTES = 64 * 1024 * 1024
+
+# Least recently used masks come first; the lock guards the dict and the
+# byte total, since zone chunks run on several threads.
+_mask_cache = OrderedDict()
+_mask_cache_bytes = 0
+_mask_cache_lock = threading.Lock()
+
 
 def _empty_stats():
     result = {key: float("nan") for key in _STAT_KEYS}
@@ -29,15 +53,49 @@ def _empty_stats():
     return result
 
 
+def _stats_from_counts(counts):
+    """
+    Compute summary statistics from a histogram of small unsigned integers.
+
+    counts[v] is the number of cells holding value v. The results match
+    stats_from_values on the expanded values, including the median of an
+    even count being the mean of the two middle values.
+    """
+    n = int(counts.sum())
+    present = np.flatnonzero(counts)
+    levels = np.arange(counts.size, dtype="float64")
+    mean = float(counts @ levels) / n
+    var = float(counts @ (levels - mean) ** 2) / n
+    # The k-th smallest value (0-based) is the first level whose running
+    # count exceeds k.
+    cumulative = np.cumsum(counts)
+    lower = int(np.searchsorted(cumulative, (n - 1) // 2, side="right"))
+    upper = int(np.searchsorted(cumulative, n // 2, side="right"))
+    return {
+        "min": float(present[0]),
+        "max": float(present[-1]),
+        "mean": mean,
+        "median": (lower + upper) / 2.0,
+        "std": float(np.sqrt(var)),
+        "count": n,
+    }
+
+
 def stats_from_values(values):
     """
     Compute summary statistics from a 1-D array of raster values.
 
     Returns a dict with min, max, mean, median, std, count. Values are NaN
     and count is 0 when the array is empty.
+
+    CN rasters are uint8, so 8- and 16-bit unsigned values are summarized
+    from a np.bincount histogram in one linear pass instead of converting
+    to float64 and sorting for the median.
     """
     if values.size == 0:
         return _empty_stats()
+    if values.dtype in (np.uint8, np.uint16):
+        return _stats_from_counts(np.bincount(values))
     v = values.astype("float64")
     return {
         "min": float(v.min()),
@@ -77,13 +135,86 @@ def _read_window_for_geometry(src, geometry, pad=1):
     return data, transform
 
 
-def exact_zonal_stats(raster_path, geometries, nodata):
+def _packed_zone_mask(geometry, transform, shape):
+    """Bit-packed zone mask, cached up to MASK_CACHE_BYTES in total."""
+    global _mask_cache_bytes
+    key = (geometry, transform, shape)
+    with _mask_cache_lock:
+        packed = _mask_cache.get(key)
+        if packed is not None:
+            _mask_cache.move_to_end(key)
+            return packed
+
+    packed = np.packbits(
+        geometry_mask(
+            [geometry],
+            out_shape=shape,
+            transform=transform,
+            invert=True,
+            all_touched=False,
+        )
+    )
+    if packed.nbytes > MASK_CACHE_BYTES:
+        return packed
+
+    with _mask_cache_lock:
+        if key not in _mask_cache:
+            _mask_cache[key] = packed
+            _mask_cache_bytes += packed.nbytes
+        while _mask_cache_bytes > MASK_CACHE_BYTES:
+            _, evicted = _mask_cache.popitem(last=False)
+            _mask_cache_bytes -= evicted.nbytes
+    return packed
+
+
+def _zone_mask(geometry, transform, shape):
+    """
+    True where a cell center in the window falls inside the zone polygon.
+
+    Rasterizing the polygon is the costly step, and re-running a model on
+    the same watersheds and grid (for example after changing only the
+    dual-group replacements) asks for the same masks again. Masks are cached
+    bit-packed by geometry, window transform, and window shape, and the
+    least recently used ones are dropped once the cache exceeds
+    MASK_CACHE_BYTES.
+    """
+    packed = _packed_zone_mask(geometry, transform, shape)
+    return np.unpackbits(packed, count=shape[0] * shape[1]).reshape(shape).astype(bool)
+
+
+def _zonal_stats_serial(raster_path, geometries, nodata):
+    """Summarize geometries in order using a single open raster handle."""
+    results = []
+    with rasterio.open(raster_path) as src:
+        for geometry in geometries:
+            if geometry is None or geometry.is_empty:
+                results.append(_empty_stats())
+                continue
+            data, transform = _read_window_for_geometry(src, geometry)
+            if data is None:
+                results.append(_empty_stats())
+                continue
+            # True where the cell center falls inside the zone polygon.
+            member = _zone_mask(geometry, transform, data.shape)
+            if np.issubdtype(data.dtype, np.floating):
+                member &= np.isfinite(data)
+            if nodata is not None:
+                member &= data != nodata
+            results.append(stats_from_values(data[member]))
+    return results
+
+
+def exact_zonal_stats(raster_path, geometries, nodata, max_workers=None):
     """
     Exact-clip zonal statistics for a list of geometries over a raster.
 
     A cell is assigned to a zone when its center falls inside the zone
     polygon, exactly matching a raster clipped to that polygon. Cells
-    holding the NoData value are excluded.
+    holding the NoData value are excluded. Each zone reads only the raster
+    window under its bounding box, and zones are split into contiguous
+    chunks that are summarized in parallel threads. There are several
+    chunks per thread, so one very large watershed does not leave the
+    other threads idle.
 
     Parameters
     ----------
@@ -93,33 +224,26 @@ def exact_zonal_stats(raster_path, geometries, nodata):
         Zone polygons in the same CRS as the raster.
     nodata : float or None
         NoData value to exclude from the statistics.
+    max_workers : int, optional
+        Number of reader threads. Defaults to MAX_WORKERS; 1 runs serially.
 
     Returns
     -------
     list of dict
         One statistics dict per geometry, in the same order as the input.
     """
-    results = []
-    with rasterio.open(raster_path) as src:
-        for geometry in geometries:
-            if geometry is None or geometry.is_empty:
-                results.append(_empty_stats())
-                continue
-            data, transform = _read_window_for_geometry(src, geometry)
-            if data is None:
-                results.append(_empty_stats())
-                continue
-            # True where the cell center falls inside the zone polygon.
-            inside = geometry_mask(
-                [geometry],
-                out_shape=data.shape,
-                transform=transform,
-                invert=True,
-                all_touched=False,
-            )
-            values = data.astype("float64")
-            member = inside & np.isfinite(values)
-            if nodata is not None:
-                member &= values != nodata
-            results.append(stats_from_values(values[member]))
-    return results
+    geometries = list(geometries)
+    if max_workers is None:
+        max_workers = MAX_WORKERS
+    workers = min(max_workers, len(geometries))
+    if workers <= 1:
+        return _zonal_stats_serial(raster_path, geometries, nodata)
+
+    # rasterio datasets are not thread-safe, so every chunk opens its own.
+    size = -(-len(geometries) // (workers * CHUNKS_PER_WORKER))
+    chunks = [geometries[i:i + size] for i in range(0, len(geometries), size)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        parts = pool.map(
+            lambda chunk: _zonal_stats_serial(raster_path, chunk, nodata), chunks
+        )
+        return [stats for part in parts for stats in part]
@@ -0,0 +1,156 @@
+"""Regression tests for CNStatistics against the previous pandas versions."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+gpd = pytest.importorskip("geopandas")
+from shapely.geometry import box
+
+from src.cn_statistics import CNStatistics
+
+
+def _previous_global_stats(cn_gdf):
+    """calculate_global_stats as it was before the numpy rewrite."""
+    valid_cn = cn_gdf[cn_gdf['CN'].notna()]['CN']
+    stats = {
+        'count': len(valid_cn),
+        'min': valid_cn.min(),
+        'max': valid_cn.max(),
+        'mean': valid_cn.mean(),
+        'median': valid_cn.median(),
+        'std': valid_cn.std(),
+        'unique_values': len(valid_cn.unique()),
+    }
+    if 'area_ha' in cn_gdf.columns:
+        weights = cn_gdf[cn_gdf['CN'].notna()]['area_ha']
+        stats['weighted_mean'] = np.average(valid_cn, weights=weights)
+        for p in [25, 50, 90]:
+            stats[f'percentile_{p}'] = np.percentile(valid_cn, p)
+    return stats
+
+
+def _previous_distribution(cn_gdf):
+    """generate_cn_distribution as it was before the bincount rewrite."""
+    if 'area_ha' in cn_gdf.columns:
+        distribution = cn_gdf.groupby('CN').agg({
+            'area_ha': 'sum',
+            'geometry': 'count'
+        }).rename(columns={'geometry': 'polygon_count'})
+        total_area = distribution['area_ha'].sum()
+        distribution['area_percent'] = (distribution['area_ha'] / total_area * 100).round(2)
+        distribution['cumulative_percent'] = distribution['area_percent'].cumsum()
+    else:
+        distribution = cn_gdf.groupby('CN').size().to_frame('count')
+        distribution['percent'] = (distribution['count'] / distribution['count'].sum() * 100).round(2)
+    return distribution.reset_index()
+
+
+def _previous_classes(cn_values):
+    """classify_cn_ranges as it was before the np.digitize rewrite."""
+    conditions = [
+        cn_values < 40,
+        (cn_values >= 40) & (cn_values < 60),
+        (cn_values >= 60) & (cn_values < 80),
+        cn_values >= 80
+    ]
+    choices = [
+        'Low Runoff Potential',
+        'Moderate Runoff Potential',
+        'High Runoff Potential',
+        'Very High Runoff Potential'
+    ]
+    return pd.Series(np.select(conditions, choices, default='Unknown'),
+                     index=cn_values.index)
+
+
+def _cn_frame(cn, area=True, dtype=None):
+    cn = pd.Series(cn, dtype=dtype)
+    data = {'CN': cn}
+    if area:
+        data['area_ha'] = np.linspace(1.0, 2.0, len(cn)) if len(cn) else []
+    return gpd.GeoDataFrame(data, geometry=[box(i, 0, i + 1, 1) for i in range(len(cn))])
+
+
+CASES = {
+    'mixed': [55.0, 72.0, np.nan, 98.0, 72.0, 61.0, np.nan, 30.0],
+    'fractional': [55.5, 72.25, 72.25, np.nan, 98.0],
+    'constant': [77.0, 77.0, 77.0],
+    'single': [64.0],
+    'with_nan_constant': [np.nan, 81.0, np.nan, 81.0],
+}
+
+
+def _assert_stats_equal(got, want):
+    assert set(got) == set(want)
+    for key, value in want.items():
+        assert got[key] == pytest.approx(float(value), nan_ok=True), key
+
+
+@pytest.mark.parametrize('area', [True, False])
+@pytest.mark.parametrize('case', sorted(CASES))
+def test_global_stats_match_previous_version(case, area):
+    gdf = _cn_frame(CASES[case], area=area)
+    _assert_stats_equal(CNStatistics.calculate_global_stats(gdf), _previous_global_stats(gdf))
+
+
+def test_global_stats_accept_uint8_cn():
+    gdf = _cn_frame([30, 55, 55, 98], dtype='uint8')
+    stats = CNStatistics.calculate_global_stats(gdf)
+    _assert_stats_equal(stats, _previous_global_stats(gdf))
+    assert isinstance(stats['min'], float) and isinstance(stats['count'], int)
+
+
+@pytest.mark.parametrize('cn', [[], [np.nan, np.nan]])
+def test_global_stats_of_no_valid_cn_are_empty(cn):
+    # The previous version raised ZeroDivisionError from np.average here
+    stats = CNStatistics.calculate_global_stats(_cn_frame(cn))
+    assert stats['count'] == 0
+    assert stats['unique_values'] == 0
+    assert all(np.isnan(value) for key, value in stats.items()
+               if key not in ('count', 'unique_values'))
+
+
+def test_global_stats_weighted_mean_of_zero_area_is_nan():
+    gdf = _cn_frame([50.0, 70.0])
+    gdf['area_ha'] = 0.0
+    assert np.isnan(CNStatistics.calculate_global_stats(gdf)['weighted_mean'])
+
+
+@pytest.mark.parametrize('area', [True, False])
+@pytest.mark.parametrize('case', sorted(CASES))
+def test_distribution_matches_previous_version(case, area):
+    gdf = _cn_frame(CASES[case], area=area)
+    pd.testing.assert_frame_equal(
+        CNStatistics.generate_cn_distribution(gdf), _previous_distribution(gdf),
+        check_dtype=False,
+    )
+
+
+def test_distribution_of_uint8_cn_keeps_the_dtype():
+    distribution = CNStatistics.generate_cn_distribution(_cn_frame([98, 30, 98], dtype='uint8'))
+    assert distribution['CN'].dtype == np.uint8
+    assert list(distribution['CN']) == [30, 98]
+    assert list(distribution['polygon_count']) == [1, 2]
+
+
+@pytest.mark.parametrize('area', [True, False])
+@pytest.mark.parametrize('cn', [[], [np.nan, np.nan]])
+def test_distribution_of_no_valid_cn_is_empty(cn, area):
+    distribution = CNStatistics.generate_cn_distribution(_cn_frame(cn, area=area))
+    previous = _previous_distribution(_cn_frame(cn, area=area))
+    assert len(distribution) == 0
+    assert list(distribution.columns) == list(previous.columns)
+
+
+@pytest.mark.parametrize('values', [
+    [0.0, 39.99, 40.0, 59.9, 60.0, 79.99, 80.0, 100.0],
+    [np.nan, 45.0, np.nan],
+    [77.0, 77.0],
+    [],
+])
+def test_classes_match_previous_version(values):
+    cn = pd.Series(values, dtype=float, index=range(10, 10 + len(values)))
+    pd.testing.assert_series_equal(
+        CNStatistics.classify_cn_ranges(cn), _previous_classes(cn), check_dtype=False
+    )
@@ -0,0 +1,218 @@
+"""Regression tests for CurveNumberCalculator."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+gpd = pytest.importorskip("geopandas")
+shapely = pytest.importorskip("shapely")
+from shapely.geometry import box
+
+from src.curve_number_calculator import CurveNumberCalculator
+
+UTM = "EPSG:32617"
+
+
+def _overlapping_soil():
+    """Voronoi soil polygons buffered by 40 m, so neighbours overlap."""
+    rng = np.random.default_rng(0)
+    extent = box(0, 0, 5000, 5000)
+    cells = shapely.get_parts(shapely.voronoi_polygons(
+        shapely.multipoints(rng.uniform(0, 5000, (60, 2))), extend_to=extent
+    ))
+    return gpd.GeoDataFrame(
+        {'HYDGRP': rng.choice(list('ABCD'), len(cells))},
+        geometry=shapely.buffer(shapely.intersection(cells, extent), 40),
+        crs=UTM,
+    )
+
+
+def _landuse_grid():
+    rng = np.random.default_rng(1)
+    cells = [box(x, y, x + 500, y + 500)
+             for x in range(0, 5000, 500) for y in range(0, 5000, 500)]
+    return gpd.GeoDataFrame(
+        {'LUValue': rng.choice([21, 41, 82, 90], len(cells))},
+        geometry=cells,
+        crs=UTM,
+    )
+
+
+def test_dissolve_falls_back_on_overlapping_pieces():
+    calc = CurveNumberCalculator(crs=UTM)
+    overlapping = gpd.GeoDataFrame(
+        {'CN': [70, 70, 70]},
+        geometry=[box(0, 0, 10, 10), box(5, 5, 15, 15), box(8, 0, 20, 6)],
+        crs=UTM,
+    )
+
+    dissolved = calc.dissolve_by_cn(overlapping)
+
+    expected = shapely.union_all(overlapping.geometry.to_numpy())
+    assert len(dissolved) == 1
+    assert dissolved.geometry.iloc[0].is_valid
+    assert dissolved.geometry.iloc[0].symmetric_difference(expected).area < 1e-6
+
+
+def test_pipeline_with_overlapping_soil_matches_general_union():
+    calc = CurveNumberCalculator(crs=UTM)
+    lookup = calc.load_lookup_table(use_nlcd=True)
+    soil = calc.preprocess_soil_data(_overlapping_soil(), 'HYDGRP', {})
+    landuse = calc.preprocess_landuse_data(_landuse_grid(), 'LUValue')
+    pieces = calc.compute_intersection(soil, landuse, 'HYDGRP', 'LUValue')
+    cn_gdf = calc.assign_curve_numbers(pieces, lookup, 'HYDGRP', 'LUValue')
+
+    coverage = calc.dissolve_by_cn(cn_gdf)
+    general = calc.dissolve_by_cn(cn_gdf, assume_coverage=False)
+
+    assert list(coverage['CN']) == list(general['CN'])
+    for got, want in zip(coverage.geometry, general.geometry):
+        assert got.is_valid
+        assert got.symmetric_difference(want).area < 1e-3
+
+
+def _cn_areas(calc, soil, landuse, defer):
+    lookup = calc.load_lookup_table(use_nlcd=True)
+    soil = calc.preprocess_soil_data(soil, 'HYDGRP', {}, skip_reproject=defer)
+    landuse = calc.preprocess_landuse_data(landuse, 'LUValue', skip_reproject=defer)
+    pieces = calc.compute_intersection(soil, landuse, 'HYDGRP', 'LUValue')
+    cn_gdf = calc.assign_curve_numbers(pieces, lookup, 'HYDGRP', 'LUValue')
+    return calc.dissolve_by_cn(cn_gdf).set_index('CN')['area_ha']
+
+
+def test_deferred_reprojection_keeps_areas_within_tolerance():
+    calc = CurveNumberCalculator(crs=UTM)
+    soil = _overlapping_soil().to_crs('EPSG:4326')
+    landuse = _landuse_grid().to_crs('EPSG:4326')
+    assert calc.shares_source_crs(soil, landuse)
+
+    deferred = _cn_areas(calc, soil, landuse, defer=True)
+    eager = _cn_areas(calc, soil, landuse, defer=False)
+
+    assert list(deferred.index) == list(eager.index)
+    # Intersecting in EPSG:4326 moves edge crossings slightly, so the areas
+    # are close but not identical to reprojecting first
+    assert deferred.sum() == pytest.approx(eager.sum(), rel=1e-3)
+    assert ((deferred - eager).abs() / eager).max() < 5e-3
+
+
+def _tiled_soil():
+    """Non-overlapping Voronoi soil polygons over a 5 km square."""
+    rng = np.random.default_rng(2)
+    extent = box(0, 0, 5000, 5000)
+    cells = shapely.get_parts(shapely.voronoi_polygons(
+        shapely.multipoints(rng.uniform(0, 5000, (40, 2))), extend_to=extent
+    ))
+    return gpd.GeoDataFrame(
+        {'HYDGRP': rng.choice(list('ABCD'), len(cells))},
+        geometry=shapely.intersection(cells, extent),
+        crs=UTM,
+    )
+
+
+def _shifted_landuse():
+    """Land use grid offset from the soil, so each layer has area the other lacks."""
+    landuse = _landuse_grid()
+    landuse['geometry'] = landuse.geometry.translate(750, -600)
+    return landuse
+
+
+def _areas_by_attributes(gdf):
+    return (
+        gdf.assign(area=gdf.geometry.area)
+        .groupby(['HYDGRP', 'LUValue'], dropna=False)['area'].sum()
+        .sort_index()
+    )
+
+
+@pytest.mark.parametrize('how', ['intersection', 'identity', 'union'])
+def test_compute_intersection_matches_overlay(how):
+    calc = CurveNumberCalculator(crs=UTM)
+    soil = _tiled_soil()
+    landuse = _shifted_landuse()
+
+    pieces = calc.compute_intersection(soil, landuse, 'HYDGRP', 'LUValue', how=how)
+    expected = gpd.overlay(soil, landuse, how=how)
+
+    assert pieces.crs == expected.crs
+    assert pieces.geometry.is_valid.all()
+    pd.testing.assert_series_equal(
+        _areas_by_attributes(pieces), _areas_by_attributes(expected), rtol=1e-9
+    )
+    assert pieces.geometry.area.sum() == pytest.approx(expected.geometry.area.sum(), rel=1e-9)
+
+
+def test_compute_intersection_rejects_unknown_mode():
+    calc = CurveNumberCalculator(crs=UTM)
+    with pytest.raises(ValueError):
+        calc.compute_intersection(_tiled_soil(), _landuse_grid(), 'HYDGRP', 'LUValue',
+                                  how='difference')
+
+
+def _assert_intersection_matches_overlay(soil, landuse):
+    calc = CurveNumberCalculator(crs=UTM)
+    pieces = calc.compute_intersection(soil, landuse, 'HYDGRP', 'LUValue')
+    expected = gpd.overlay(soil, landuse, how='intersection', keep_geom_type=True)
+
+    assert len(pieces) == len(expected)
+    assert pieces.geometry.is_valid.all()
+    if len(expected):
+        pd.testing.assert_series_equal(
+            _areas_by_attributes(pieces), _areas_by_attributes(expected), rtol=1e-9
+        )
+    return pieces
+
+
+def test_intersection_of_an_empty_layer_is_empty():
+    pieces = _assert_intersection_matches_overlay(_tiled_soil().iloc[:0], _landuse_grid())
+    assert list(pieces.columns) == ['HYDGRP', 'LUValue', 'geometry']
+
+
+def test_intersection_of_constant_layers_is_one_piece():
+    soil = gpd.GeoDataFrame({'HYDGRP': ['B']}, geometry=[box(0, 0, 100, 100)], crs=UTM)
+    landuse = gpd.GeoDataFrame({'LUValue': [41]}, geometry=[box(50, 0, 150, 100)], crs=UTM)
+
+    pieces = _assert_intersection_matches_overlay(soil, landuse)
+
+    assert pieces.geometry.iloc[0].area == pytest.approx(5000)
+
+
+def test_intersection_keeps_missing_soil_groups():
+    soil = _tiled_soil()
+    soil.loc[soil.index[::3], 'HYDGRP'] = None
+    pieces = _assert_intersection_matches_overlay(soil, _landuse_grid())
+    assert pieces['HYDGRP'].isna().any()
+
+
+def test_intersection_drops_edge_contacts_and_keeps_slivers():
+    soil = gpd.GeoDataFrame(
+        {'HYDGRP': ['A', 'B']}, geometry=[box(0, 0, 10, 10), box(10, 0, 20, 10)], crs=UTM
+    )
+    landuse = gpd.GeoDataFrame(
+        {'LUValue': [21, 41, 82]},
+        geometry=[
+            box(-5, 0, 10, 10),              # touches soil B along x=10 only
+            box(19.999999, 0, 20.5, 10),     # 1e-6 m sliver over soil B
+            shapely.Polygon([(10, 0), (15, 0), (15, 5), (10, 10)]),
+        ],
+        crs=UTM,
+    )
+
+    pieces = _assert_intersection_matches_overlay(soil, landuse)
+
+    sliver = pieces[pieces['LUValue'] == 41]
+    assert len(sliver) == 1
+    assert sliver.geometry.iloc[0].area == pytest.approx(1e-5, rel=1e-3)
+
+
+def test_intersection_repairs_invalid_polygons_like_overlay():
+    bow_tie = shapely.Polygon([(0, 0), (10, 10), (10, 0), (0, 10)])
+    soil = gpd.GeoDataFrame(
+        {'HYDGRP': ['A', 'C']}, geometry=[bow_tie, box(10, 0, 20, 10)], crs=UTM
+    )
+    landuse = gpd.GeoDataFrame({'LUValue': [21]}, geometry=[box(-5, -5, 25, 15)], crs=UTM)
+
+    pieces = _assert_intersection_matches_overlay(soil, landuse)
+
+    # Both lobes of the bow tie survive the repair
+    assert pieces.loc[pieces['HYDGRP'] == 'A'].geometry.area.sum() == pytest.approx(50)
@@ -0,0 +1,58 @@
+"""Regression tests for SpatialOperations."""
+
+import numpy as np
+import pytest
+
+gpd = pytest.importorskip("geopandas")
+rasterio = pytest.importorskip("rasterio")
+from shapely.geometry import box
+
+from src import spatial_operations
+from src.spatial_operations import SpatialOperations
+
+UTM = "EPSG:32617"
+
+
+def _cn_squares():
+    cells = [box(x, y, x + 100, y + 100)
+             for x in range(0, 2000, 100) for y in range(0, 2000, 100)]
+    cn = np.random.default_rng(0).integers(30, 99, len(cells)).astype(np.uint8)
+    return gpd.GeoDataFrame({'CN': cn}, geometry=cells, crs=UTM)
+
+
+def test_burn_raises_gdal_cache_in_bytes(monkeypatch):
+    seen = []
+    rasterize = spatial_operations.features.rasterize
+
+    def recording_rasterize(*args, **kwargs):
+        seen.append(rasterio.env.getenv()['GDAL_CACHEMAX'])
+        return rasterize(*args, **kwargs)
+
+    monkeypatch.setattr(spatial_operations.features, 'rasterize', recording_rasterize)
+    out = np.zeros((2000, 2000), dtype=np.uint8)
+    gdf = _cn_squares()
+    SpatialOperations._burn_cn_polygons(
+        zip(gdf.geometry.values, gdf['CN'].to_numpy()), out,
+        rasterio.transform.from_bounds(0, 0, 2000, 2000, 2000, 2000),
+    )
+
+    # GDAL_CACHEMAX is read as bytes; a megabyte count here would shrink
+    # the cache to a few hundred bytes and slow the burn twentyfold
+    assert seen
+    assert all(value >= 512 * 1024 * 1024 for value in seen)
+    assert all(value >= 2 * out.nbytes for value in seen)
+
+
+def test_create_cn_raster_burns_every_polygon(tmp_path):
+    gdf = _cn_squares()
+    path = SpatialOperations.create_cn_raster(gdf, 10, str(tmp_path / 'cn.tif'))
+
+    with rasterio.open(path) as src:
+        data = src.read(1)
+        rows, cols = rasterio.transform.rowcol(
+            src.transform, gdf.geometry.centroid.x, gdf.geometry.centroid.y
+        )
+
+    assert data.shape == (200, 200)
+    assert (data != 0).all()
+    np.testing.assert_array_equal(data[rows, cols], gdf['CN'].to_numpy())
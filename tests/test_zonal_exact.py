@@ -0,0 +1,110 @@
+"""Regression tests for the exact-clip zonal statistics."""
+
+import numpy as np
+import pytest
+
+rasterio = pytest.importorskip("rasterio")
+from rasterio.transform import from_origin
+from shapely.geometry import box
+
+from src import zonal_exact
+
+
+@pytest.fixture
+def empty_mask_cache(monkeypatch):
+    monkeypatch.setattr(zonal_exact, "_mask_cache", zonal_exact.OrderedDict())
+    monkeypatch.setattr(zonal_exact, "_mask_cache_bytes", 0)
+    return zonal_exact._mask_cache
+
+
+def test_mask_cache_reuses_masks(empty_mask_cache):
+    transform = from_origin(0, 100, 1, 1)
+    zone = box(10, 10, 60, 40)
+
+    first = zonal_exact._zone_mask(zone, transform, (100, 100))
+    second = zonal_exact._zone_mask(zone, transform, (100, 100))
+
+    assert len(empty_mask_cache) == 1
+    assert first.sum() == 50 * 30
+    np.testing.assert_array_equal(first, second)
+
+
+def test_mask_cache_stays_within_its_byte_budget(empty_mask_cache, monkeypatch):
+    # Each 100 x 100 mask packs to 1250 bytes; the budget fits three
+    monkeypatch.setattr(zonal_exact, "MASK_CACHE_BYTES", 4000)
+    transform = from_origin(0, 100, 1, 1)
+    zones = [box(i, i, i + 50, i + 50) for i in range(6)]
+
+    for zone in zones:
+        zonal_exact._zone_mask(zone, transform, (100, 100))
+
+    assert zonal_exact._mask_cache_bytes <= 4000
+    assert len(empty_mask_cache) == 3
+    # The most recently used masks are the ones kept
+    assert [key[0] for key in empty_mask_cache] == zones[-3:]
+
+
+def test_mask_larger_than_the_budget_is_not_cached(empty_mask_cache, monkeypatch):
+    monkeypatch.setattr(zonal_exact, "MASK_CACHE_BYTES", 100)
+
+    mask = zonal_exact._zone_mask(box(0, 0, 50, 50), from_origin(0, 100, 1, 1), (100, 100))
+
+    assert mask.sum() == 2500
+    assert not empty_mask_cache
+    assert zonal_exact._mask_cache_bytes == 0
+
+
+@pytest.mark.parametrize('values', [
+    [],
+    [77],
+    [77, 77, 77, 77],
+    [0, 255, 30, 98, 98, 55],        # even count: median of the two middle values
+    [30, 98, 98, 55, 61],
+])
+@pytest.mark.parametrize('dtype', ['uint8', 'uint16'])
+def test_histogram_stats_match_float_stats(values, dtype):
+    got = zonal_exact.stats_from_values(np.array(values, dtype=dtype))
+    want = zonal_exact.stats_from_values(np.array(values, dtype='float64'))
+
+    assert got['count'] == want['count']
+    for key in ('min', 'max', 'mean', 'median', 'std'):
+        assert got[key] == pytest.approx(want[key], nan_ok=True), key
+
+
+def _write_raster(path, data, nodata):
+    with rasterio.open(
+        path, 'w', driver='GTiff', height=data.shape[0], width=data.shape[1],
+        count=1, dtype=data.dtype, crs='EPSG:32617',
+        transform=from_origin(0, data.shape[0], 1, 1), nodata=nodata,
+    ) as dst:
+        dst.write(data, 1)
+    return str(path)
+
+
+def test_zonal_stats_skip_nodata_and_nan_cells(tmp_path, empty_mask_cache):
+    cn = np.random.default_rng(0).integers(30, 99, (40, 40)).astype('uint8')
+    cn[:5] = 0
+    as_float = np.where(cn == 0, np.nan, cn).astype('float32')
+    zones = [
+        box(0, 0, 40, 40),
+        box(0, 35, 40, 40),        # only NoData rows
+        box(10, 10, 10.3, 30),     # thinner than a cell: no cell centers
+        box(20, 0, 30, 10),
+    ]
+
+    by_histogram = zonal_exact.exact_zonal_stats(
+        _write_raster(tmp_path / 'cn.tif', cn, 0), zones, nodata=0, max_workers=1
+    )
+    by_values = zonal_exact.exact_zonal_stats(
+        _write_raster(tmp_path / 'cn_float.tif', as_float, None), zones, nodata=None,
+        max_workers=1,
+    )
+
+    for got, want in zip(by_histogram, by_values):
+        assert got['count'] == want['count']
+        for key in ('min', 'max', 'mean', 'median', 'std'):
+            assert got[key] == pytest.approx(want[key], nan_ok=True), key
+    assert by_histogram[0]['count'] == 35 * 40
+    assert by_histogram[1]['count'] == 0
+    assert by_histogram[2]['count'] == 0
+    assert by_histogram[3]['min'] == cn[30:40, 20:30].min()